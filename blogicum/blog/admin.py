@@ -1,9 +1,73 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.contrib.admin.views.main import PAGE_VAR
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.db.models import Q
+from django.template.response import TemplateResponse
 
-from .models import Category, Location, Post, Comment
+from .auxiliary import recount_comments
+from .bulk import (
+    delete_categories_in_batches,
+    delete_posts_in_batches,
+    update_in_batches,
+)
+from .forms import LimitedImageField
+from .mixins import IndexedSearchMixin
+from .models import Category, Comment, ImageJob, Location, Post
+from .pagination import EstimatedCountPaginator
+from .search import matching_ids
 
 
-class CategoryAdmin(admin.ModelAdmin):
+User = get_user_model()
+
+
+class BulkActionsMixin:
+    # Actions that run as batched UPDATE/DELETE statements instead of a
+    # save() or delete() per row. delete_in_batches() is set by subclasses.
+    actions = ('publish', 'unpublish', 'delete_selected_in_batches')
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
+
+    @admin.action(description='Опубликовать выбранные',
+                  permissions=('change',))
+    def publish(self, request, queryset):
+        total = update_in_batches(queryset, is_published=True)
+        self.message_user(request, f'Опубликовано: {total}.')
+
+    @admin.action(description='Снять с публикации выбранные',
+                  permissions=('change',))
+    def unpublish(self, request, queryset):
+        total = update_in_batches(queryset, is_published=False)
+        self.message_user(request, f'Снято с публикации: {total}.')
+
+    @admin.action(description='Удалить выбранные', permissions=('delete',))
+    def delete_selected_in_batches(self, request, queryset):
+        if request.POST.get('post') != 'yes':
+            # Only the number of rows is shown, never the rows themselves.
+            return TemplateResponse(
+                request, 'admin/blog/delete_in_batches_confirmation.html', {
+                    **self.admin_site.each_context(request),
+                    'opts': self.model._meta,
+                    'count': queryset.count(),
+                    'select_across': request.POST.get('select_across'),
+                    'selected': request.POST.getlist(
+                        helpers.ACTION_CHECKBOX_NAME
+                    ),
+                    'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+                }
+            )
+        total = self.delete_in_batches(queryset)
+        self.message_user(request, f'Удалено: {total}.')
+
+
+class CategoryAdmin(BulkActionsMixin, IndexedSearchMixin,
+                    admin.ModelAdmin):
     list_display = (
         'title',
         'slug',
@@ -11,8 +75,16 @@ class CategoryAdmin(admin.ModelAdmin):
     )
     list_editable = ('is_published',)
     search_fields = ('title', 'description')
+    search_index = 'blog_category_fts'
     list_filter = ('is_published',)
 
+    def get_search_condition(self, search_term):
+        return (super().get_search_condition(search_term)
+                | Q(slug=search_term.strip()))
+
+    def delete_in_batches(self, queryset):
+        return delete_categories_in_batches(queryset)
+
 
 class LocationAdmin(admin.ModelAdmin):
     list_display = (
@@ -25,7 +97,15 @@ class LocationAdmin(admin.ModelAdmin):
     list_filter = ('created_at',)
 
 
-class PostAdmin(admin.ModelAdmin):
+class PostActionForm(helpers.ActionForm):
+    category = forms.ModelChoiceField(
+        queryset=Category.objects.all(),
+        required=False,
+        label='Категория'
+    )
+
+
+class PostAdmin(BulkActionsMixin, IndexedSearchMixin, admin.ModelAdmin):
     list_display = (
         'title',
         'author',
@@ -36,16 +116,131 @@ class PostAdmin(admin.ModelAdmin):
     )
     list_filter = ('category', 'is_published', 'pub_date')
     search_fields = ('title', 'text')
+    search_index = 'blog_post_fts'
     list_editable = ('is_published',)
+    list_select_related = ('author', 'category', 'location')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    autocomplete_fields = ('author', 'category', 'location')
+    action_form = PostActionForm
+    actions = BulkActionsMixin.actions + ('change_category',)
+    formfield_overrides = {
+        models.ImageField: {'form_class': LimitedImageField},
+    }
+
+    @admin.action(description='Перенести выбранные в категорию',
+                  permissions=('change',))
+    def change_category(self, request, queryset):
+        try:
+            category = self.action_form.base_fields['category'].clean(
+                request.POST.get('category')
+            )
+        except ValidationError:
+            category = None
+        if category is None:
+            self.message_user(
+                request, 'Выберите категорию.', level=messages.WARNING
+            )
+            return
+        total = update_in_batches(queryset, category=category)
+        self.message_user(request, f'Перенесено: {total}.')
+
+    def delete_in_batches(self, queryset):
+        return delete_posts_in_batches(queryset)
 
 
-class CommentAdmin(admin.ModelAdmin):
+class InputFilter(admin.SimpleListFilter):
+    # A text box instead of a list of every related object, so the sidebar
+    # costs nothing however large the related table is.
+    template = 'admin/input_filter.html'
+    placeholder = ''
+
+    def lookups(self, request, model_admin):
+        return ()
+
+    def has_output(self):
+        return True
+
+    def choices(self, changelist):
+        params = {
+            name: value for name, value in changelist.params.items()
+            if name not in (self.parameter_name, PAGE_VAR)
+        }
+        yield {
+            'parameter_name': self.parameter_name,
+            'value': self.value(),
+            'placeholder': self.placeholder,
+            'params': params,
+            'reset_query_string': changelist.get_query_string(
+                remove=[self.parameter_name]
+            ),
+        }
+
+
+class AuthorFilter(InputFilter):
+    title = 'автору'
+    parameter_name = 'author'
+    placeholder = 'Имя пользователя'
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(author__in=User.objects.filter(
+                username=self.value().strip()
+            ))
+        return queryset
+
+
+class PostFilter(InputFilter):
+    title = 'публикации'
+    parameter_name = 'post'
+    placeholder = 'Номер или заголовок'
+
+    def queryset(self, request, queryset):
+        value = (self.value() or '').strip()
+        if value.isdigit():
+            return queryset.filter(post_id=int(value))
+        if value:
+            return queryset.filter(post__in=matching_ids(
+                'blog_post_fts', value, columns=('title',)
+            ))
+        return queryset
+
+
+class CommentAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display = ('text', 'author', 'post', 'created_at')
-    list_filter = ('created_at', 'author', 'post')
+    list_filter = ('created_at', AuthorFilter, PostFilter)
+    list_select_related = ('author', 'post')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    autocomplete_fields = ('author', 'post')
     search_fields = ('text', 'author__username', 'post__title')
+    search_index = 'blog_comment_fts'
+
+    def get_search_condition(self, search_term):
+        # Each branch is an IN over an indexed column: the comment text
+        # index, the unique username and the post title index.
+        return (
+            super().get_search_condition(search_term)
+            | Q(author__in=User.objects.filter(username=search_term.strip()))
+            | Q(post__in=matching_ids(
+                'blog_post_fts', search_term, columns=('title',)
+            ))
+        )
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change and 'post' in form.changed_data:
+            recount_comments([form.initial['post'], obj.post_id])
+
+
+class ImageJobAdmin(admin.ModelAdmin):
+    list_display = ('post', 'status', 'attempts', 'run_after', 'created_at')
+    list_filter = ('status',)
+    readonly_fields = ('post', 'image', 'attempts', 'locked_at', 'last_error')
 
 
 admin.site.register(Category, CategoryAdmin)
 admin.site.register(Location, LocationAdmin)
 admin.site.register(Post, PostAdmin)
 admin.site.register(Comment, CommentAdmin)
+admin.site.register(ImageJob, ImageJobAdmin)
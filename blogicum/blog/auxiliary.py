@@ -1,32 +1,73 @@
+from datetime import timedelta
+
 from django.conf import settings
 from django.core.paginator import Paginator
-from django.db.models import Count
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
-from .models import Post
+from .models import Comment, Post
+from .pagination import KeysetPaginator
 
 
 def paginate_queryset(request, queryset, per_page=settings.LIMIT_POST):
     return Paginator(queryset, per_page).get_page(request.GET.get('page'))
 
 
-def get_posts(
-    posts=Post.objects,
-    apply_filtering=True,
-    apply_annotation=True
-):
+def publication_cutoff():
+    now = timezone.now()
+    granularity = settings.PUBLICATION_CUTOFF_GRANULARITY
+    if not granularity:
+        return now
+    return now - timedelta(seconds=now.timestamp() % granularity)
+
+
+def published_posts_filter():
+    return Q(
+        is_published=True,
+        pub_date__lt=publication_cutoff(),
+        category__is_published=True
+    )
+
+
+def visible_posts_filter(user):
+    visible = published_posts_filter()
+    if user.is_authenticated:
+        visible |= Q(author=user)
+    return visible
+
+
+def get_posts(posts=Post.objects, apply_filtering=True):
     posts = posts.select_related('category', 'location', 'author')
 
     if apply_filtering:
-        posts = posts.filter(
-            is_published=True,
-            pub_date__lt=timezone.now(),
-            category__is_published=True
-        )
-
-    if apply_annotation:
-        posts = posts.annotate(
-            comment_count=Count('comments')
-        )
+        posts = posts.filter(published_posts_filter())
 
     return posts.order_by(*Post._meta.ordering)
+
+
+def paginate_comments(post, cursor=None):
+    return KeysetPaginator(
+        post.comments.select_related('author'),
+        settings.LIMIT_COMMENTS,
+        ordering=Comment._meta.ordering
+    ).get_page(cursor)
+
+
+def comment_count_subquery():
+    return Coalesce(
+        Subquery(
+            Comment.objects.filter(post=OuterRef('pk'))
+            .order_by()
+            .values('post')
+            .annotate(total=Count('pk'))
+            .values('total')
+        ),
+        0
+    )
+
+
+def recount_comments(post_ids):
+    return Post.objects.filter(pk__in=post_ids).update(
+        comment_count=comment_count_subquery()
+    )
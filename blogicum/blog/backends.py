@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+
+USER_KEY_PREFIX = 'blog:user'
+# Cached in place of the password hash, which never leaves the database.
+SESSION_HASH_KEY = '_session_auth_hash'
+
+
+def user_cache():
+    return caches[settings.USER_CACHE_ALIAS]
+
+
+def user_cache_key(user_id):
+    return f'{USER_KEY_PREFIX}:{user_id}'
+
+
+def user_to_cache(user):
+    data = {
+        field.attname: getattr(user, field.attname)
+        for field in user._meta.concrete_fields if field.name != 'password'
+    }
+    data[SESSION_HASH_KEY] = user.get_session_auth_hash()
+    return data
+
+
+def user_from_cache(data):
+    # The password stays deferred: reading it loads it from the database,
+    # and save() writes only the fields that are loaded.
+    data = dict(data)
+    session_hash = data.pop(SESSION_HASH_KEY)
+    user = get_user_model().from_db(
+        DEFAULT_DB_ALIAS, list(data), list(data.values())
+    )
+
+    def get_session_auth_hash():
+        if 'password' in user.__dict__:
+            return type(user).get_session_auth_hash(user)
+        return session_hash
+
+    user.get_session_auth_hash = get_session_auth_hash
+    return user
+
+
+class CachedModelBackend(ModelBackend):
+    # The user of every authenticated request is loaded through get_user();
+    # its fields are cached until the user is saved or deleted.
+    def get_user(self, user_id):
+        cache = user_cache()
+        key = user_cache_key(user_id)
+        data = cache.get(key)
+        if data is not None:
+            user = user_from_cache(data)
+            return user if self.user_can_authenticate(user) else None
+        user = super().get_user(user_id)
+        if user is not None:
+            cache.set(key, user_to_cache(user), settings.USER_CACHE_TIMEOUT)
+        return user
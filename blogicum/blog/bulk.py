@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.db import transaction
+
+from .cache import ALL_SCOPE, invalidate
+from .images import release_image
+from .models import Post
+
+
+def iter_pk_batches(queryset):
+    # Keyset over the primary key: each batch is one indexed range read,
+    # however far into the selection it is.
+    pks = queryset.order_by('pk').values_list('pk', flat=True)
+    last_pk = None
+    while True:
+        batch = pks if last_pk is None else pks.filter(pk__gt=last_pk)
+        batch = list(batch[:settings.ADMIN_ACTION_BATCH_SIZE])
+        if not batch:
+            return
+        last_pk = batch[-1]
+        yield batch
+
+
+def update_in_batches(queryset, **values):
+    # One UPDATE per batch. save() and the model signals are bypassed, so
+    # caches are invalidated once at the end; the search indexes follow
+    # through their triggers.
+    manager = queryset.model._base_manager
+    total = 0
+    for batch in iter_pk_batches(queryset):
+        with transaction.atomic():
+            total += manager.filter(pk__in=batch).update(**values)
+    invalidate(ALL_SCOPE)
+    return total
+
+
+def raw_delete(model, **lookups):
+    # A single DELETE without collecting the rows, for relations whose
+    # delete signals would only touch rows deleted along with them.
+    queryset = model._base_manager.filter(**lookups)
+    return queryset._raw_delete(queryset.db)
+
+
+def delete_posts_in_batches(queryset):
+    storage = Post._meta.get_field('image').storage
+    total = 0
+    for batch in iter_pk_batches(queryset):
+        images = list(
+            Post.objects.filter(pk__in=batch)
+            .exclude(image='').exclude(image__isnull=True)
+            .values_list('image', 'image_renditions')
+        )
+        with transaction.atomic():
+            # Comments and image jobs cascade with their post.
+            for relation in Post._meta.related_objects:
+                raw_delete(
+                    relation.related_model,
+                    **{f'{relation.field.name}__in': batch}
+                )
+            total += raw_delete(Post, pk__in=batch)
+            for name, renditions in images:
+                transaction.on_commit(
+                    lambda name=name, renditions=renditions: release_image(
+                        storage, name, renditions or {}
+                    )
+                )
+    invalidate(ALL_SCOPE)
+    return total
+
+
+def delete_categories_in_batches(queryset):
+    total = 0
+    for batch in iter_pk_batches(queryset):
+        with transaction.atomic():
+            Post.objects.filter(category__in=batch).update(category=None)
+            total += raw_delete(queryset.model, pk__in=batch)
+    invalidate(ALL_SCOPE)
+    return total
@@ -0,0 +1,120 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .auxiliary import publication_cutoff
+from .routers import primary_reads
+
+VERSION_KEY_PREFIX = 'blog:version'
+PAGE_KEY_PREFIX = 'blog:page'
+COUNT_KEY_PREFIX = 'blog:count'
+# Bumped when many cached objects change at once.
+ALL_SCOPE = 'all'
+# Every cached page depends on this scope: categories, locations and
+# users are shown on pages that cannot be listed cheaply.
+PAGES_SCOPE = 'pages'
+# Post lists: the index, category and profile feeds.
+FEED_SCOPE = 'feed'
+
+
+def _version_key(scope):
+    return f'{VERSION_KEY_PREFIX}:{scope}'
+
+
+def _initial_version():
+    # A lost version key must not restart from a value that was already used.
+    return time.time_ns()
+
+
+def get_versions(*scopes):
+    keys = [_version_key(scope) for scope in scopes]
+    versions = cache.get_many(keys)
+    missing = {
+        key: _initial_version() for key in keys if key not in versions
+    }
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def bump_versions(*scopes):
+    for scope in scopes:
+        key = _version_key(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _initial_version(), timeout=None)
+
+
+def invalidate(*scopes):
+    # Bump again after commit: a request running between the first bump and
+    # the commit may have cached the old rows under the new version.
+    bump_versions(*scopes)
+    transaction.on_commit(lambda: bump_versions(*scopes))
+
+
+def post_card_scopes(post):
+    return (
+        ALL_SCOPE,
+        f'post:{post.pk}',
+        f'category:{post.category_id}',
+        f'location:{post.location_id}',
+        f'user:{post.author_id}',
+    )
+
+
+def feed_count_cache_key(scope, variant=''):
+    versions = get_versions(ALL_SCOPE, PAGES_SCOPE, scope)
+    return ':'.join(map(str, (
+        COUNT_KEY_PREFIX, scope, variant,
+        int(publication_cutoff().timestamp()), *versions
+    )))
+
+
+def page_cache_key(request, scopes):
+    versions = get_versions(ALL_SCOPE, PAGES_SCOPE, *scopes)
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return ':'.join(map(str, (
+        PAGE_KEY_PREFIX, request.method, path,
+        int(publication_cutoff().timestamp()), *versions
+    )))
+
+
+def cache_anonymous_page(*scopes):
+    # Scopes may refer to the view kwargs, e.g. 'post:{post_id}'. The key
+    # also holds the publication cutoff, so it rolls over as scheduled
+    # posts come out.
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            timeout = settings.PAGE_CACHE_TIMEOUT
+            if (not timeout or request.method not in ('GET', 'HEAD')
+                    or request.user.is_authenticated):
+                return view(request, *args, **kwargs)
+
+            key = page_cache_key(
+                request, [scope.format(**kwargs) for scope in scopes]
+            )
+            response = cache.get(key)
+            if response is not None:
+                return response
+
+            # Pages are cached only from the primary: a lagging replica
+            # would fill the version bumped by a write with the old rows.
+            with primary_reads():
+                response = view(request, *args, **kwargs)
+            if response.status_code == 200:
+                if callable(getattr(response, 'render', None)):
+                    response.add_post_render_callback(
+                        lambda rendered: cache.set(key, rendered, timeout)
+                    )
+                else:
+                    cache.set(key, response, timeout)
+            return response
+        return wrapper
+    return decorator
@@ -1,6 +1,11 @@
 from django import forms
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.files.images import get_image_dimensions
+from django.db import transaction
 
+from .jobs import enqueue_image_job
 from .models import Post, Comment
 
 
@@ -13,16 +18,60 @@ class UserEditForm(forms.ModelForm):
         fields = ('username', 'first_name', 'last_name', 'email',)
 
 
+class LimitedImageField(forms.ImageField):
+    # Size and pixel count are checked before Pillow opens the file; the
+    # dimensions are read from the image header alone.
+    default_error_messages = {
+        'too_large': 'Файл больше %(limit)s МБ.',
+        'too_many_pixels': (
+            'Изображение %(width)s×%(height)s больше %(limit)s Мпикс.'
+        ),
+    }
+
+    def to_python(self, data):
+        if data in self.empty_values:
+            return super().to_python(data)
+        if data.size > settings.POST_IMAGE_MAX_SIZE:
+            raise ValidationError(
+                self.error_messages['too_large'],
+                code='too_large',
+                params={'limit': settings.POST_IMAGE_MAX_SIZE // 2 ** 20},
+            )
+        width, height = get_image_dimensions(data)
+        if width and height and (
+                width * height > settings.POST_IMAGE_MAX_PIXELS):
+            raise ValidationError(
+                self.error_messages['too_many_pixels'],
+                code='too_many_pixels',
+                params={
+                    'width': width,
+                    'height': height,
+                    'limit': f'{settings.POST_IMAGE_MAX_PIXELS / 10 ** 6:g}',
+                },
+            )
+        return super().to_python(data)
+
+
 class PostForm(forms.ModelForm):
     class Meta:
         model = Post
         exclude = ('author', )
+        field_classes = {'image': LimitedImageField}
         widgets = {
             'pub_date': forms.DateTimeInput(
                 attrs={'type': 'datetime-local'}, format='%Y-%m-%dT%H:%M'
             )
         }
 
+    def save(self, commit=True):
+        if not commit:
+            return super().save(commit=False)
+        with transaction.atomic():
+            post = super().save()
+            if 'image' in self.changed_data:
+                enqueue_image_job(post)
+        return post
+
 
 class CommentCreateForm(forms.ModelForm):
     class Meta:
@@ -0,0 +1,143 @@
+from datetime import timedelta
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .models import Post
+from .storage import HASHED_NAME
+
+RENDITIONS_DIR = 'renditions'
+FORMATS = {
+    'jpeg': ('JPEG', 'jpg', {'progressive': True, 'optimize': True}),
+    'webp': ('WEBP', 'webp', {'method': 4}),
+}
+
+
+def strip_metadata(image_file):
+    # Rewrites the original without EXIF (camera, GPS and so on), baking
+    # its orientation into the pixels. Returns whether the file changed.
+    with image_file.open('rb'), Image.open(image_file) as image:
+        if not image.getexif():
+            return False
+        image_format = image.format
+        icc_profile = image.info.get('icc_profile')
+        cleaned = ImageOps.exif_transpose(image)
+        content = ContentFile(b'')
+        cleaned.save(
+            content, image_format, quality=95, icc_profile=icc_profile
+        )
+    # The original is released by the post signals once nothing uses it.
+    image_file.name = image_file.storage.save(image_file.name, content)
+    return True
+
+
+def source_digest(name):
+    stem = PurePosixPath(name).stem
+    return stem if HASHED_NAME.fullmatch(stem) else ''
+
+
+def rendition_name(original_name, max_width, extension):
+    # Named after the original and the settings it was made with, so equal
+    # images share renditions and a change of settings makes new ones.
+    path = PurePosixPath(original_name)
+    quality = settings.POST_IMAGE_QUALITY
+    return str(PurePosixPath(
+        path.parts[0], RENDITIONS_DIR,
+        f'{path.stem}_{max_width}q{quality}.{extension}'
+    ))
+
+
+def generate_renditions(image_file):
+    # Downscaled copies of an uploaded image, stored next to it as
+    # {'source': name, 'sizes': {size: {'width', 'height', 'jpeg', 'webp'}}}.
+    # Images smaller than a size are recompressed but never enlarged.
+    storage = image_file.storage
+    with image_file.open('rb'), Image.open(image_file) as original:
+        original = ImageOps.exif_transpose(original).convert('RGB')
+        sizes = {}
+        for size, max_width in settings.POST_IMAGE_RENDITIONS.items():
+            image = original.copy()
+            image.thumbnail((max_width, max_width * 4), Image.LANCZOS)
+            rendition = {'width': image.width, 'height': image.height}
+            for key, (image_format, extension, options) in FORMATS.items():
+                content = ContentFile(b'')
+                image.save(
+                    content, image_format,
+                    quality=settings.POST_IMAGE_QUALITY, **options
+                )
+                name = rendition_name(image_file.name, max_width, extension)
+                rendition[key] = storage.save(name, content)
+            sizes[size] = rendition
+    return {'source': image_file.name, 'sizes': sizes}
+
+
+def delete_renditions(storage, renditions):
+    for rendition in renditions.get('sizes', {}).values():
+        for key in FORMATS:
+            if rendition.get(key):
+                storage.delete(rendition[key])
+
+
+def get_renditions(post):
+    # Renditions of a replaced image are ignored until they are rebuilt.
+    renditions = post.image_renditions or {}
+    if not post.image or renditions.get('source') != post.image.name:
+        return {}
+    return renditions['sizes']
+
+
+def recently_saved(storage, name):
+    try:
+        modified = storage.get_modified_time(name)
+    except FileNotFoundError:
+        return False
+    grace = timedelta(seconds=settings.IMAGE_RELEASE_GRACE)
+    return timezone.now() - modified < grace
+
+
+def release_image(storage, name, renditions):
+    # Files are shared between posts with the same image, so the number of
+    # posts pointing at a file is its reference count. A concurrent upload
+    # of the same bytes gets the stored name back before its post commits,
+    # so recently saved files are left to collect_orphaned_media.
+    source = renditions.get('source')
+    referenced = set(
+        Post.objects.filter(image__in=[name, source])
+        .values_list('image', flat=True)
+    )
+    if (name and name not in referenced
+            and not recently_saved(storage, name)):
+        storage.delete(name)
+    if (source and source not in referenced
+            and not recently_saved(storage, source)):
+        delete_renditions(storage, renditions)
+
+
+def process_post_image(post):
+    # The previous image and its renditions are released by the post
+    # signals once the new ones are saved. Returns False without saving
+    # when the post was deleted or given another image meanwhile; the
+    # files made for it are left to collect_orphaned_media.
+    image = post.image.name or ''
+    current = Q(image=image) if image else Q(image='') | Q(image__isnull=True)
+    update_fields = ['image_renditions', 'renditions_digest']
+    post.image_renditions = {}
+    post.renditions_digest = ''
+    if post.image:
+        if strip_metadata(post.image):
+            update_fields.append('image')
+        post.image_renditions = generate_renditions(post.image)
+        post.renditions_digest = source_digest(post.image.name)
+    with transaction.atomic():
+        # Locks the row while checking that it still holds the processed
+        # image, so a newer upload cannot be overwritten with this one.
+        if not Post.objects.filter(current, pk=post.pk).update(
+                image=F('image')):
+            return False
+        post.save(update_fields=update_fields)
+    return True
@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .images import process_post_image
+from .models import ImageJob
+
+
+def enqueue_image_job(post):
+    # Called in the transaction that saves the post, so the job is never
+    # picked up before the upload is committed.
+    return ImageJob.objects.create(
+        post=post, image=post.image.name or '', run_after=timezone.now()
+    )
+
+
+def claim_next_job():
+    # A RUNNING job whose lock is older than IMAGE_JOB_LOCK_TIMEOUT
+    # belonged to a worker that died, and may be taken again.
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.IMAGE_JOB_LOCK_TIMEOUT)
+    claimable = ImageJob.objects.filter(
+        Q(status=ImageJob.PENDING, run_after__lte=now)
+        | Q(status=ImageJob.RUNNING, locked_at__lt=stale)
+    )
+    for job_id in claimable.values_list('pk', flat=True)[:10]:
+        # The conditional update makes claiming safe between workers.
+        claimed = claimable.filter(pk=job_id).update(
+            status=ImageJob.RUNNING, locked_at=now, attempts=F('attempts') + 1
+        )
+        if claimed:
+            return ImageJob.objects.select_related('post').get(pk=job_id)
+    return None
+
+
+def finish_job(job, **fields):
+    # A conditional update: the job is gone if its post was deleted.
+    for name, value in fields.items():
+        setattr(job, name, value)
+    ImageJob.objects.filter(pk=job.pk).update(**fields)
+
+
+def run_job(job):
+    post = job.post
+    try:
+        # A newer upload has its own job, and a deleted post needs none;
+        # either way this one is superseded.
+        if (post.image.name or '') == job.image:
+            process_post_image(post)
+    except Exception as error:
+        last_error = f'{type(error).__name__}: {error}'
+        if job.attempts < settings.IMAGE_JOB_MAX_ATTEMPTS:
+            delay = settings.IMAGE_JOB_RETRY_DELAY * 2 ** (job.attempts - 1)
+            finish_job(
+                job, status=ImageJob.PENDING, last_error=last_error,
+                run_after=timezone.now() + timedelta(seconds=delay)
+            )
+        else:
+            finish_job(job, status=ImageJob.FAILED, last_error=last_error)
+        return False
+    finish_job(job, status=ImageJob.DONE, last_error='')
+    return True
@@ -0,0 +1,85 @@
+import time
+from wsgiref.util import setup_testing_defaults
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test.utils import override_settings
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время обработки запросов через WSGI-приложение с новым'
+        ' и с постоянным соединением с базой данных.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default='/',
+            help='Какую страницу запрашивать.'
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=200,
+            help='Сколько запросов отправить в каждом режиме.'
+        )
+        parser.add_argument(
+            '--host',
+            default='localhost',
+            help='Значение заголовка Host.'
+        )
+        parser.add_argument(
+            '--database',
+            default='default',
+            help='Для какой базы данных менять CONN_MAX_AGE.'
+        )
+
+    def handle(self, *args, path, requests, host, database, **options):
+        from blogicum.wsgi import application
+
+        connection = connections[database]
+        max_age = connection.settings_dict['CONN_MAX_AGE']
+        opened = []
+
+        def count_connection(sender, connection, **kwargs):
+            if connection.alias == database:
+                opened.append(connection)
+
+        connection_created.connect(count_connection)
+        try:
+            # Cached pages would not touch the database at all.
+            with override_settings(PAGE_CACHE_TIMEOUT=0):
+                for label, age in (
+                    ('Новое соединение', 0),
+                    ('Постоянное соединение', max_age or None),
+                ):
+                    connection.close()
+                    connection.settings_dict['CONN_MAX_AGE'] = age
+                    opened.clear()
+                    elapsed = self.time_requests(
+                        application, path, host, requests
+                    )
+                    self.stdout.write(
+                        f'{label}: {elapsed / requests * 1000:.2f} мс на'
+                        f' запрос, открыто соединений: {len(opened)}.'
+                    )
+        finally:
+            connection_created.disconnect(count_connection)
+            connection.settings_dict['CONN_MAX_AGE'] = max_age
+
+    def time_requests(self, application, path, host, requests):
+        def start_response(status, headers, exc_info=None):
+            if not status.startswith('200'):
+                raise CommandError(f'Страница {path} вернула {status}.')
+
+        started = time.perf_counter()
+        for _ in range(requests):
+            environ = {'PATH_INFO': path, 'HTTP_HOST': host}
+            setup_testing_defaults(environ)
+            response = application(environ, start_response)
+            b''.join(response)
+            # Fires request_finished, which closes expired connections.
+            response.close()
+        return time.perf_counter() - started
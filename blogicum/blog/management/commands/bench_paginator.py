@@ -0,0 +1,62 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.views.generic import ListView
+
+from blog.pagination import FeedPaginationMixin
+
+PER_PAGE = 10
+
+
+class RangeFeedView(FeedPaginationMixin, ListView):
+    # A feed over a range, so only pagination and rendering are measured.
+    pagination = 'offset'
+    paginate_by = PER_PAGE
+    template_name = 'includes/paginator.html'
+    n_pages = 1
+
+    def get_queryset(self):
+        return range(self.n_pages * PER_PAGE)
+
+
+class Command(BaseCommand):
+    help = (
+        'Измеряет время отрисовки пагинатора ленты в зависимости от числа'
+        ' страниц.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pages',
+            type=int,
+            nargs='+',
+            default=[10, 1000, 100000],
+            help='Число страниц ленты, для каждого замер отдельно.'
+        )
+        parser.add_argument(
+            '--page',
+            type=int,
+            default=5,
+            help='Номер открытой страницы.'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Сколько раз отрисовать каждую ленту.'
+        )
+
+    def handle(self, *args, pages, page, repeat, **options):
+        factory = RequestFactory()
+        for n_pages in pages:
+            view = RangeFeedView.as_view(n_pages=n_pages)
+            request = factory.get('/', {'page': min(page, n_pages)})
+            started = time.perf_counter()
+            for _ in range(repeat):
+                content = view(request).render().content
+            elapsed = (time.perf_counter() - started) / repeat
+            self.stdout.write(
+                f'Страниц: {n_pages}: {elapsed * 1000:.2f} мс на отрисовку,'
+                f' ссылок: {content.decode("utf-8").count("page-link")}.'
+            )
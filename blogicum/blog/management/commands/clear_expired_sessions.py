@@ -0,0 +1,38 @@
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from blog.bulk import raw_delete
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет истёкшие сессии порциями. Запускайте по расписанию,'
+        ' например из cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Сколько сессий удалять за один запрос.'
+        )
+
+    def handle(self, *args, batch_size, **options):
+        # Short transactions keep the sessions table open to logins while
+        # a large backlog is removed.
+        expired = Session.objects.filter(
+            expire_date__lt=timezone.now()
+        ).values_list('pk', flat=True)
+        total = 0
+        while True:
+            keys = list(expired[:batch_size])
+            if not keys:
+                break
+            with transaction.atomic():
+                total += raw_delete(Session, pk__in=keys)
+        self.stdout.write(
+            self.style.SUCCESS(f'Удалено истёкших сессий: {total}.')
+        )
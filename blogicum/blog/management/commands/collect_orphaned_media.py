@@ -0,0 +1,173 @@
+import os
+import posixpath
+import shutil
+import time
+from itertools import islice
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.images import RENDITIONS_DIR
+from blog.models import Post
+from blog.storage import DERIVED_NAME
+
+# Names and digests are looked up this many at a time, to stay within
+# the 999 query parameters older SQLite versions allow.
+LOOKUP_CHUNK_SIZE = 500
+
+
+def iter_files(root):
+    # Depth-first os.scandir walk, so memory is bounded by the depth of
+    # the tree and one directory listing rather than the number of files.
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry
+
+
+def iter_batches(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет или переносит в карантин файлы изображений публикаций, на'
+        ' которые не ссылается ни одна публикация.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать файлы, ничего не удаляя.'
+        )
+        parser.add_argument(
+            '--quarantine',
+            metavar='DIR',
+            help='Переносить файлы в этот каталог вместо удаления.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Сколько файлов проверять за один запрос.'
+        )
+        parser.add_argument(
+            '--min-age',
+            type=int,
+            default=60 * 60,
+            help=(
+                'Не трогать файлы моложе стольких секунд: их публикация'
+                ' может быть ещё не сохранена.'
+            )
+        )
+
+    def handle(self, *args, dry_run, quarantine, batch_size, min_age,
+               **options):
+        self.media_root = Path(settings.MEDIA_ROOT)
+        self.upload_to = Post._meta.get_field('image').upload_to
+        root = self.media_root / self.upload_to
+        if not root.is_dir():
+            self.stdout.write('Каталог изображений пуст.')
+            return
+        self.quarantine = Path(quarantine) if quarantine else None
+        if self.quarantine and self.quarantine.resolve().is_relative_to(
+                root.resolve()):
+            raise CommandError('Карантин не может лежать внутри медиа.')
+
+        self.legacy_renditions = self.get_legacy_renditions(batch_size)
+        newest = time.time() - min_age
+        checked = orphaned = freed = 0
+        for batch in iter_batches(iter_files(root), batch_size):
+            names = {
+                Path(entry.path).relative_to(self.media_root).as_posix():
+                entry for entry in batch
+                if entry.stat(follow_symlinks=False).st_mtime < newest
+            }
+            for name in sorted(names.keys() - self.get_referenced(names)):
+                size = names[name].stat(follow_symlinks=False).st_size
+                self.stdout.write(name)
+                if not dry_run:
+                    self.remove(name)
+                orphaned += 1
+                freed += size
+            checked += len(batch)
+            self.stderr.write(
+                f'Проверено файлов: {checked}, без ссылок: {orphaned}.'
+            )
+
+        action = 'Найдено' if dry_run else (
+            'Перенесено в карантин' if self.quarantine else 'Удалено'
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'{action} файлов: {orphaned} ({freed / 2 ** 20:.1f} МБ).'
+        ))
+
+    def get_legacy_renditions(self, batch_size):
+        # Renditions made before content hashing cannot be traced back to
+        # their post by name. They are few, so they are gathered from the
+        # post table up front, a batch of posts at a time.
+        names = set()
+        posts = Post.objects.exclude(image_renditions={}).order_by('pk')
+        last_pk = 0
+        while batch := list(
+                posts.filter(pk__gt=last_pk)
+                .values_list('pk', 'image_renditions')[:batch_size]):
+            last_pk = batch[-1][0]
+            for _, renditions in batch:
+                names.update(
+                    name for name in self.rendition_names(renditions)
+                    if not self.is_derived(name)
+                )
+        return names
+
+    @staticmethod
+    def rendition_names(renditions):
+        for rendition in renditions.get('sizes', {}).values():
+            yield from (
+                value for key, value in rendition.items()
+                if isinstance(value, str)
+            )
+
+    @staticmethod
+    def is_derived(name):
+        stem = posixpath.splitext(posixpath.basename(name))[0]
+        return DERIVED_NAME.fullmatch(stem) is not None
+
+    def get_referenced(self, names):
+        referenced = set()
+        for chunk in iter_batches(sorted(names), LOOKUP_CHUNK_SIZE):
+            referenced.update(
+                Post.objects.filter(image__in=chunk)
+                .values_list('image', flat=True)
+            )
+        renditions_prefix = f'{self.upload_to}/{RENDITIONS_DIR}/'
+        digests = {
+            posixpath.basename(name)[:64] for name in names
+            if name.startswith(renditions_prefix) and self.is_derived(name)
+        }
+        # A derived rendition starts with the digest of its original,
+        # wherever that is stored.
+        for chunk in iter_batches(sorted(digests), LOOKUP_CHUNK_SIZE):
+            for renditions in Post.objects.filter(
+                    renditions_digest__in=chunk
+            ).values_list('image_renditions', flat=True):
+                referenced.update(self.rendition_names(renditions))
+        referenced.update(names.keys() & self.legacy_renditions)
+        return referenced
+
+    def remove(self, name):
+        path = self.media_root / name
+        if self.quarantine is None:
+            path.unlink(missing_ok=True)
+            return
+        target = self.quarantine / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(path, target)
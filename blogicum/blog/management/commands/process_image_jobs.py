@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.jobs import claim_next_job, run_job
+
+
+class Command(BaseCommand):
+    help = 'Обрабатывает очередь изображений публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Обработать готовые задачи и завершиться.'
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=2,
+            help='Сколько секунд ждать новых задач, когда очередь пуста.'
+        )
+
+    def handle(self, *args, once, sleep, **options):
+        done = failed = 0
+        try:
+            while True:
+                job = claim_next_job()
+                if job is None:
+                    if once:
+                        break
+                    time.sleep(sleep)
+                    continue
+                if run_job(job):
+                    done += 1
+                else:
+                    failed += 1
+                    self.stderr.write(
+                        f'Задача {job.pk} (попытка {job.attempts}): '
+                        f'{job.last_error}'
+                    )
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано задач: {done}, с ошибкой: {failed}.'
+        ))
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import F, Max, Min
+
+from blog.auxiliary import comment_count_subquery
+from blog.cache import ALL_SCOPE, invalidate
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает или проверяет счётчики комментариев публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только проверить счётчики, ничего не изменяя.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,
+            help='Сколько публикаций обрабатывать за один запрос.'
+        )
+
+    def handle(self, *args, check, batch_size, **options):
+        bounds = Post.objects.aggregate(low=Min('pk'), high=Max('pk'))
+        if bounds['low'] is None:
+            self.stdout.write('Публикаций нет.')
+            return
+
+        total = 0
+        for start in range(bounds['low'], bounds['high'] + 1, batch_size):
+            batch = Post.objects.filter(
+                pk__gte=start, pk__lt=start + batch_size
+            )
+            if check:
+                mismatched = batch.annotate(
+                    actual=comment_count_subquery()
+                ).exclude(comment_count=F('actual'))
+                for post_id, stored, actual in mismatched.values_list(
+                    'pk', 'comment_count', 'actual'
+                ):
+                    self.stdout.write(
+                        f'Публикация {post_id}: записано {stored}, '
+                        f'на самом деле {actual}.'
+                    )
+                    total += 1
+            else:
+                with transaction.atomic():
+                    total += batch.update(
+                        comment_count=comment_count_subquery()
+                    )
+
+        if check:
+            if total:
+                raise CommandError(f'Неверных счётчиков: {total}.')
+            self.stdout.write(self.style.SUCCESS('Все счётчики верны.'))
+        else:
+            invalidate(ALL_SCOPE)
+            self.stdout.write(
+                self.style.SUCCESS(f'Пересчитано публикаций: {total}.')
+            )
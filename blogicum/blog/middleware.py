@@ -0,0 +1,22 @@
+from django.conf import settings
+
+from .routers import PIN_COOKIE
+
+
+class PinPrimaryMiddleware:
+    # After a write the client keeps reading from the primary for
+    # REPLICA_PIN_SECONDS, long enough for the replicas to catch up.
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (settings.DATABASE_REPLICAS
+                and request.method not in ('GET', 'HEAD', 'OPTIONS')):
+            response.set_cookie(
+                PIN_COOKIE, '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
@@ -0,0 +1,77 @@
+from django.db import migrations
+
+# External-content FTS5 indexes for the admin search, built like the post
+# index in 0011.
+INDEXED_TABLES = {
+    'blog_comment': ('text',),
+    'blog_category': ('title', 'description'),
+}
+
+
+def create_sql(table, columns):
+    fts = f'{table}_fts'
+    names = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    old = ', '.join(f'old.{column}' for column in columns)
+    return (
+        f"""
+        CREATE VIRTUAL TABLE {fts} USING fts5(
+            {names},
+            content='{table}', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """,
+        f"""
+        CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new});
+        END
+        """,
+        f"""
+        CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {names})
+            VALUES ('delete', old.id, {old});
+        END
+        """,
+        f"""
+        CREATE TRIGGER {fts}_update AFTER UPDATE OF {names}
+        ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {names})
+            VALUES ('delete', old.id, {old});
+            INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new});
+        END
+        """,
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    )
+
+
+def drop_sql(table, columns):
+    fts = f'{table}_fts'
+    return (
+        f'DROP TRIGGER IF EXISTS {fts}_update',
+        f'DROP TRIGGER IF EXISTS {fts}_delete',
+        f'DROP TRIGGER IF EXISTS {fts}_insert',
+        f'DROP TABLE IF EXISTS {fts}',
+    )
+
+
+def run_on_sqlite(make_sql):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for table, columns in INDEXED_TABLES.items():
+            for statement in make_sql(table, columns):
+                schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_add_post_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_on_sqlite(create_sql), run_on_sqlite(drop_sql)
+        ),
+    ]
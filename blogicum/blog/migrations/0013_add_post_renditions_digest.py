@@ -0,0 +1,57 @@
+# Generated by Django 3.2.16 on 2026-10-17 06:37
+
+import re
+from importlib import import_module
+from pathlib import PurePosixPath
+
+from django.db import migrations, models
+
+search_index = import_module('blog.migrations.0011_add_post_search_index')
+run_on_sqlite = search_index.run_on_sqlite
+# SQLite adds a column by rebuilding blog_post, which drops the triggers
+# keeping its FTS index in sync; they are created again around the change.
+CREATE_TRIGGERS_SQL = search_index.CREATE_SQL[1:4]
+DROP_TRIGGERS_SQL = search_index.DROP_SQL[:3]
+
+
+def fill_renditions_digest(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    posts = Post.objects.exclude(image_renditions={}).only('image_renditions')
+    batch = []
+    for post in posts.iterator(chunk_size=1000):
+        stem = PurePosixPath(post.image_renditions.get('source', '')).stem
+        if re.fullmatch('[0-9a-f]{64}', stem):
+            post.renditions_digest = stem
+            batch.append(post)
+        if len(batch) == 1000:
+            Post.objects.bulk_update(batch, ['renditions_digest'])
+            batch = []
+    Post.objects.bulk_update(batch, ['renditions_digest'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_add_admin_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            migrations.RunPython.noop, run_on_sqlite(CREATE_TRIGGERS_SQL)
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='renditions_digest',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='Хеш исходника уменьшенных копий'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['renditions_digest'], name='post_renditions_digest_idx'),
+        ),
+        migrations.RunPython(
+            run_on_sqlite(CREATE_TRIGGERS_SQL), run_on_sqlite(DROP_TRIGGERS_SQL)
+        ),
+        migrations.RunPython(
+            fill_renditions_digest, migrations.RunPython.noop
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.contrib.auth import get_user_model
 from django.db import models
 
+from .storage import HashedFileSystemStorage
+
 
 User = get_user_model()
 
@@ -70,6 +72,7 @@ class Post(BaseModel):
     image = models.ImageField(
         verbose_name='Изображение',
         upload_to='posts_images',
+        storage=HashedFileSystemStorage(),
         blank=True,
         null=True
     )
@@ -88,16 +91,74 @@ class Post(BaseModel):
         null=True,
         verbose_name='Категория'
     )
+    image_renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Уменьшенные копии изображения'
+    )
+    # Digest of the image the renditions were made from, which their names
+    # start with: collect_orphaned_media traces renditions back by it.
+    renditions_digest = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        verbose_name='Хеш исходника уменьшенных копий'
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев'
+    )
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
-        ordering = ('-pub_date',)
+        ordering = ('-pub_date', '-id')
         default_related_name = 'posts'
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                condition=models.Q(is_published=True),
+                name='post_published_feed_idx'
+            ),
+            models.Index(
+                fields=('category', '-pub_date', '-id'),
+                condition=models.Q(is_published=True),
+                name='post_category_feed_idx'
+            ),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_feed_idx'
+            ),
+            models.Index(
+                fields=('image',),
+                name='post_image_idx'
+            ),
+            models.Index(
+                fields=('renditions_digest',),
+                name='post_renditions_digest_idx'
+            ),
+        )
 
     def __str__(self):
         return self.title[:PREVIEW_NAME_LENGTH]
 
+    def _do_update(self, base_qs, using, pk_val, values, update_fields,
+                   forced_update):
+        # comment_count is changed only with F() updates, so a stale value
+        # loaded into this instance must not be written back by a full
+        # save. An explicit update_fields is honoured as given, and when
+        # the row is gone the save still falls back to an INSERT.
+        if update_fields is None:
+            values = [
+                value for value in values
+                if value[0].name != 'comment_count'
+            ]
+        return super()._do_update(
+            base_qs, using, pk_val, values, update_fields, forced_update
+        )
+
 
 class Comment(BaseModel):
     text = models.TextField('Текст')
@@ -115,8 +176,73 @@ class Comment(BaseModel):
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        ordering = ('created_at', 'id')
         default_related_name = 'comments'
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at', 'id'),
+                name='comment_post_created_idx'
+            ),
+        )
 
     def __str__(self):
         return (f'Комментарий {self.author} к {self.post}: '
                 f'{self.text[:PREVIEW_NAME_LENGTH]}')
+
+
+class ImageJob(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'Ожидает'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнено'),
+        (FAILED, 'Ошибка'),
+    )
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='image_jobs',
+        verbose_name='Публикация'
+    )
+    image = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name='Изображение на момент постановки'
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=STATUSES,
+        default=PENDING,
+        verbose_name='Статус'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток'
+    )
+    run_after = models.DateTimeField(verbose_name='Не раньше')
+    locked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Взято в работу'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+    created_at = models.DateTimeField(auto_now_add=True,
+                                      verbose_name='Добавлено')
+
+    class Meta:
+        verbose_name = 'обработка изображения'
+        verbose_name_plural = 'Обработка изображений'
+        ordering = ('run_after', 'id')
+        indexes = (
+            models.Index(
+                fields=('status', 'run_after', 'id'),
+                name='imagejob_queue_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.post_id}: {self.image or "без изображения"}'
@@ -0,0 +1,252 @@
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from .routers import primary_reads
+
+CURSOR_SALT = 'blog.pagination.cursor'
+FEED_ORDERING = ('-pub_date', '-id')
+
+
+class KeysetPage:
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f'<Keyset page of {len(self.object_list)} items>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if not self._has_next:
+            return None
+        return self.paginator.encode_cursor(self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if not self._has_previous:
+            return None
+        return self.paginator.encode_cursor(
+            self.object_list[0], backwards=True
+        )
+
+    @property
+    def last_cursor(self):
+        return self.paginator.encode_cursor(None, backwards=True)
+
+
+# Seek pagination over a unique ordering: a cursor holds the ordering
+# values of the boundary row, so any page costs one index range scan.
+class KeysetPaginator:
+    is_keyset = True
+
+    def __init__(self, queryset, per_page, ordering=FEED_ORDERING):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+
+    @staticmethod
+    def _field_name(order):
+        return order.lstrip('-')
+
+    def _values(self, obj):
+        return [
+            getattr(obj, self._field_name(order)) for order in self.ordering
+        ]
+
+    def encode_cursor(self, obj, backwards=False):
+        values = None
+        if obj is not None:
+            values = [
+                value.isoformat() if hasattr(value, 'isoformat') else value
+                for value in self._values(obj)
+            ]
+        return signing.dumps(
+            {'v': values, 'b': backwards}, salt=CURSOR_SALT
+        )
+
+    def decode_cursor(self, cursor):
+        # Missing or tampered cursors fall back to the first page.
+        if not cursor:
+            return None, False
+        try:
+            data = signing.loads(cursor, salt=CURSOR_SALT)
+            values = data['v']
+            backwards = bool(data['b'])
+            if values is not None:
+                if len(values) != len(self.ordering):
+                    raise ValueError
+                opts = self.queryset.model._meta
+                values = [
+                    opts.get_field(self._field_name(order)).to_python(value)
+                    for order, value in zip(self.ordering, values)
+                ]
+        except (signing.BadSignature, ValidationError, KeyError,
+                TypeError, ValueError):
+            return None, False
+        return values, backwards
+
+    def _seek_filter(self, values, backwards):
+        condition = Q()
+        equal = {}
+        for order, value in zip(self.ordering, values):
+            name = self._field_name(order)
+            descending = order.startswith('-') != backwards
+            lookup = f'{name}__lt' if descending else f'{name}__gt'
+            condition |= Q(**equal, **{lookup: value})
+            equal[name] = value
+        return condition
+
+    def _reversed_ordering(self):
+        return tuple(
+            order[1:] if order.startswith('-') else f'-{order}'
+            for order in self.ordering
+        )
+
+    def get_page(self, cursor=None):
+        values, backwards = self.decode_cursor(cursor)
+        queryset = self.queryset
+        if values is not None:
+            queryset = queryset.filter(self._seek_filter(values, backwards))
+        ordering = self._reversed_ordering() if backwards else self.ordering
+        items = list(queryset.order_by(*ordering)[:self.per_page + 1])
+        has_more = len(items) > self.per_page
+        items = items[:self.per_page]
+
+        if backwards:
+            if not items:
+                return self.get_page()
+            items.reverse()
+            return KeysetPage(
+                items, self, has_next=values is not None,
+                has_previous=has_more
+            )
+        return KeysetPage(
+            items, self, has_next=has_more, has_previous=values is not None
+        )
+
+
+class CachedCountPaginator(Paginator):
+    def __init__(self, *args, count_cache_key=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_cache_key = count_cache_key
+
+    @cached_property
+    def count(self):
+        if self.count_cache_key is None:
+            return super().count
+        count = cache.get(self.count_cache_key)
+        if count is None:
+            with primary_reads():
+                count = self.object_list.order_by().count()
+            cache.set(
+                self.count_cache_key, count, settings.FEED_COUNT_CACHE_TIMEOUT
+            )
+        return count
+
+
+def estimated_table_rows(model, using='default'):
+    # ANALYZE stores the row count of a table as the first number of the
+    # stat of each of its indexes; None until the table was analyzed.
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1',
+                [model._meta.db_table]
+            )
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    return int(row[0].split()[0]) if row else None
+
+
+class EstimatedCountPaginator(Paginator):
+    # Counts at most ADMIN_COUNT_ESTIMATE_THRESHOLD + 1 rows. Past that an
+    # unfiltered list reports the row count ANALYZE recorded for the
+    # table, and a filtered one reports just past the threshold, so its
+    # deepest pages are reached by narrowing the filter instead.
+    estimated = False
+
+    @cached_property
+    def count(self):
+        threshold = settings.ADMIN_COUNT_ESTIMATE_THRESHOLD
+        queryset = self.object_list.order_by()
+        count = queryset[:threshold + 1].count()
+        if count <= threshold:
+            return count
+        self.estimated = True
+        if not queryset.query.where:
+            estimate = estimated_table_rows(queryset.model, queryset.db)
+            if estimate is not None:
+                return max(estimate, count)
+        return count
+
+
+class FeedPaginationMixin:
+    # 'offset' or 'keyset'; None follows settings.FEED_PAGINATION.
+    pagination = None
+    cursor_kwarg = 'cursor'
+    paginator_class = CachedCountPaginator
+    page_range_on_each_side = 2
+    page_range_on_ends = 1
+
+    def get_count_cache_key(self):
+        return None
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        return super().get_paginator(
+            queryset, per_page,
+            count_cache_key=self.get_count_cache_key(), **kwargs
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        if (self.pagination or settings.FEED_PAGINATION) != 'keyset':
+            return super().paginate_queryset(queryset, page_size)
+        paginator = KeysetPaginator(queryset, page_size)
+        page = paginator.get_page(self.request.GET.get(self.cursor_kwarg))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        paginator, page = context['paginator'], context['page_obj']
+        # Other query parameters, such as a search query, are kept in the
+        # page links.
+        params = self.request.GET.copy()
+        params.pop(self.page_kwarg, None)
+        params.pop(self.cursor_kwarg, None)
+        context['page_query'] = f'{params.urlencode()}&' if params else ''
+        if page is not None and not getattr(paginator, 'is_keyset', False):
+            context['page_range'] = paginator.get_elided_page_range(
+                page.number,
+                on_each_side=self.page_range_on_each_side,
+                on_ends=self.page_range_on_ends
+            )
+        return context
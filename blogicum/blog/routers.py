@@ -0,0 +1,70 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+
+# Set by PinPrimaryMiddleware after a write, so the writer reads it back
+# from the primary rather than from a replica that may lag behind.
+PIN_COOKIE = 'pin_primary'
+
+# The replica serving the current request: one per request, so its COUNT
+# and its rows come from the same point in time.
+_replica = ContextVar('replica', default=None)
+_primary_only = ContextVar('primary_only', default=False)
+
+
+def is_pinned(request):
+    return PIN_COOKIE in request.COOKIES
+
+
+@contextmanager
+def primary_reads():
+    # For reads whose result is cached: a lagging replica would store stale
+    # rows under a version bumped after the write.
+    token = _primary_only.set(True)
+    try:
+        yield
+    finally:
+        _primary_only.reset(token)
+
+
+class ReplicaRouter:
+    # Reads go to a replica only inside views wrapped with
+    # read_from_replica; everything else, and every write, uses 'default'.
+    def db_for_read(self, model, **hints):
+        if _primary_only.get():
+            return None
+        return _replica.get()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema from the primary.
+        return db not in settings.DATABASE_REPLICAS
+
+
+def read_from_replica(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if (request.method not in ('GET', 'HEAD')
+                or not settings.DATABASE_REPLICAS or is_pinned(request)
+                or _primary_only.get()):
+            return view(request, *args, **kwargs)
+        token = _replica.set(random.choice(settings.DATABASE_REPLICAS))
+        try:
+            response = view(request, *args, **kwargs)
+            # Template responses evaluate their querysets while rendering,
+            # which would otherwise happen after the reset below.
+            if callable(getattr(response, 'render', None)):
+                response.render()
+            return response
+        finally:
+            _replica.reset(token)
+    return wrapper
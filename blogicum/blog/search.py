@@ -0,0 +1,63 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+# Control characters cannot come from a post's text through the form, so
+# they safely mark the matches in a snippet until it is escaped.
+MATCH_START, MATCH_END = '\x02', '\x03'
+SNIPPET_TOKENS = 24
+WORD = re.compile(r'\w+')
+
+
+def match_expression(query, columns=()):
+    # Every word is quoted, so FTS5 syntax typed by a user is never parsed,
+    # and matched as a prefix, so 'велосипед' finds 'велосипеды'.
+    # columns limits the match to some of the indexed columns.
+    column_filter = f'{{{" ".join(columns)}}} : ' if columns else ''
+    return ' '.join(
+        f'{column_filter}"{word}"*' for word in WORD.findall(query)
+    )
+
+
+def matching_ids(fts_table, query, columns=()):
+    # For pk__in=...: the rowids of the FTS index equal the primary keys.
+    return RawSQL(
+        f'SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH %s',
+        (match_expression(query, columns),)
+    )
+
+
+def search_posts(posts, query):
+    expression = match_expression(query)
+    if not expression:
+        return posts.none()
+    if connection.vendor != 'sqlite':
+        condition = Q()
+        for word in WORD.findall(query):
+            condition &= Q(title__icontains=word) | Q(text__icontains=word)
+        return posts.filter(condition)
+    return posts.extra(
+        select={
+            'rank': 'blog_post_fts.rank',
+            'snippet': 'snippet(blog_post_fts, -1, %s, %s, %s, %s)',
+        },
+        select_params=(MATCH_START, MATCH_END, '…', SNIPPET_TOKENS),
+        tables=['blog_post_fts'],
+        where=[
+            'blog_post_fts.rowid = blog_post.id',
+            'blog_post_fts MATCH %s',
+        ],
+        params=[expression],
+    ).order_by('rank', '-pub_date', '-id')
+
+
+def highlight(snippet):
+    return mark_safe(
+        escape(snippet)
+        .replace(MATCH_START, '<mark>')
+        .replace(MATCH_END, '</mark>')
+    )
@@ -0,0 +1,149 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.signals import request_started
+from django.db import connections, transaction
+from django.db.backends.signals import connection_created
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .backends import user_cache, user_cache_key
+from .cache import FEED_SCOPE, PAGES_SCOPE, invalidate
+from .images import release_image
+from .models import Category, Comment, Location, Post
+
+User = get_user_model()
+
+IMAGE_FIELDS = {'image', 'image_renditions'}
+FEED_FIELDS = {'category', 'category_id', 'author', 'author_id'}
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(request_started)
+def check_connection_health(sender, **kwargs):
+    # Django only checks a persistent connection after an error in the
+    # previous request; one dropped by the server in between would
+    # otherwise fail the first query of this request.
+    for connection in connections.all():
+        if (connection.settings_dict.get('CONN_HEALTH_CHECKS')
+                and connection.connection is not None
+                and not connection.is_usable()):
+            connection.close()
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, **kwargs):
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1
+    )
+
+
+@receiver((post_save, post_delete), sender=Post)
+def invalidate_post(sender, instance, **kwargs):
+    # The counts of the feeds the post has left change as well.
+    previous = getattr(instance, '_previous', None) or {}
+    category_ids = {instance.category_id, previous.get('category_id')}
+    author_ids = {instance.author_id, previous.get('author_id')}
+    invalidate(
+        f'post:{instance.pk}',
+        FEED_SCOPE,
+        'count:index',
+        *(f'count:author:{pk}' for pk in author_ids if pk is not None),
+        *(f'count:category:{pk}' for pk in category_ids if pk is not None),
+    )
+
+
+def release_image_on_commit(post, name, renditions):
+    if name or renditions:
+        storage = post.image.storage
+        transaction.on_commit(
+            lambda: release_image(storage, name, renditions)
+        )
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_post(sender, instance, update_fields=None, **kwargs):
+    # The stored image and feeds of the post, read in one query for the
+    # post_save receivers.
+    instance._previous = None
+    if instance.pk is None or (
+            update_fields is not None
+            and not (IMAGE_FIELDS | FEED_FIELDS) & set(update_fields)):
+        return
+    instance._previous = Post.objects.filter(pk=instance.pk).values(
+        'image', 'image_renditions', 'category_id', 'author_id'
+    ).first()
+
+
+@receiver(post_save, sender=Post)
+def release_previous_image(sender, instance, update_fields=None, **kwargs):
+    previous = getattr(instance, '_previous', None)
+    if previous is None or (
+            update_fields is not None
+            and not IMAGE_FIELDS & set(update_fields)):
+        return
+    name, renditions = previous['image'], previous['image_renditions']
+    current = instance.image.name or ''
+    release_image_on_commit(
+        instance,
+        name if name and name != current else '',
+        renditions if renditions and renditions != instance.image_renditions
+        else {},
+    )
+
+
+@receiver(post_delete, sender=Post)
+def release_deleted_image(sender, instance, **kwargs):
+    release_image_on_commit(
+        instance, instance.image.name or '', instance.image_renditions or {}
+    )
+
+
+@receiver((post_save, post_delete), sender=Comment)
+def invalidate_commented_post(sender, instance, **kwargs):
+    invalidate(f'post:{instance.post_id}', FEED_SCOPE)
+
+
+@receiver((post_save, post_delete), sender=Category)
+def invalidate_category(sender, instance, **kwargs):
+    invalidate(f'category:{instance.pk}', PAGES_SCOPE)
+
+
+@receiver((post_save, post_delete), sender=Location)
+def invalidate_location(sender, instance, **kwargs):
+    invalidate(f'location:{instance.pk}', PAGES_SCOPE)
+
+
+@receiver((post_save, post_delete), sender=User)
+def invalidate_user(sender, instance, update_fields=None, **kwargs):
+    # Logging in only touches last_login, which no page shows.
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    invalidate(f'user:{instance.pk}', PAGES_SCOPE)
+
+
+@receiver((post_save, post_delete), sender=User)
+def forget_cached_user(sender, instance, **kwargs):
+    # Covers profile edits and password changes, which also change the
+    # session hash checked against the cached user. The second delete
+    # drops a copy cached from the old row before the commit.
+    cache = user_cache()
+    key = user_cache_key(instance.pk)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
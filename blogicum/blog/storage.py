@@ -0,0 +1,66 @@
+import hashlib
+import os
+import posixpath
+import re
+
+from django.core.files.base import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+# The stem of a stored file's name: the SHA-256 of its content.
+HASHED_NAME = re.compile(r'[0-9a-f]{64}')
+# Names derived from a stored file, e.g. '<digest>_640q82.jpg' for a
+# rendition, are already unique to their content and are kept.
+DERIVED_NAME = re.compile(r'[0-9a-f]{64}_\w+')
+
+
+@deconstructible
+class HashedFileSystemStorage(FileSystemStorage):
+    # Files are named after the SHA-256 of their content and sharded by its
+    # first two hex digits under the top-level directory of the requested
+    # name, the field's upload_to: re-saving a stored file under its own
+    # name must not nest it one shard deeper. Saving bytes that are already
+    # stored returns the existing name and only touches the file, so a
+    # stored file never changes and may be cached forever.
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        stem = posixpath.splitext(posixpath.basename(name))[0]
+        if not DERIVED_NAME.fullmatch(stem):
+            name = self.hashed_name(name, content)
+        try:
+            self.touch(name)
+        except FileNotFoundError:
+            pass
+        else:
+            return name
+        try:
+            return super().save(name, content, max_length)
+        except FileExistsError:
+            # Written meanwhile by a concurrent save of the same bytes.
+            return name
+
+    def get_available_name(self, name, max_length=None):
+        # A file that appeared under a content-derived name holds these
+        # very bytes; a '<name>_<random>' copy would match DERIVED_NAME and
+        # never be traced back to a post.
+        if self.exists(name):
+            raise FileExistsError(name)
+        return super().get_available_name(name, max_length)
+
+    def touch(self, name):
+        # release_image() keeps a file saved within IMAGE_RELEASE_GRACE: the
+        # post reusing it may not be committed yet.
+        os.utime(self.path(name))
+
+    def hashed_name(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        digest = digest.hexdigest()
+        directory = name.split('/')[0] if '/' in name else ''
+        extension = posixpath.splitext(name)[1].lower()
+        return posixpath.join(directory, digest[:2], digest + extension)
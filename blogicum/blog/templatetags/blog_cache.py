@@ -0,0 +1,16 @@
+from types import SimpleNamespace
+
+from django import template
+from django.conf import settings
+
+from blog.cache import get_versions, post_card_scopes
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_card_cache(post):
+    return SimpleNamespace(
+        timeout=settings.POST_CARD_CACHE_TIMEOUT,
+        version='.'.join(map(str, get_versions(*post_card_scopes(post))))
+    )
@@ -0,0 +1,26 @@
+from django import template
+
+from blog.images import get_renditions
+
+register = template.Library()
+
+
+@register.inclusion_tag('includes/post_image.html')
+def post_image(post, size):
+    renditions = get_renditions(post)
+    storage = post.image.storage
+    image = {'src': post.image.url}
+    if size in renditions:
+        by_width = sorted(renditions.values(), key=lambda r: r['width'])
+        image.update(
+            src=storage.url(renditions[size]['jpeg']),
+            width=renditions[size]['width'],
+            height=renditions[size]['height'],
+            srcset=', '.join(
+                f'{storage.url(r["jpeg"])} {r["width"]}w' for r in by_width
+            ),
+            webp_srcset=', '.join(
+                f'{storage.url(r["webp"])} {r["width"]}w' for r in by_width
+            ),
+        )
+    return {'image': image, 'lazy': size != 'detail'}
@@ -0,0 +1,10 @@
+from django import template
+
+from blog.search import highlight as highlight_snippet
+
+register = template.Library()
+
+
+@register.filter
+def highlight(snippet):
+    return highlight_snippet(snippet)
@@ -0,0 +1,44 @@
+from functools import wraps
+
+from django.conf import settings
+from django.core.files.uploadhandler import (
+    MemoryFileUploadHandler,
+    TemporaryFileUploadHandler,
+)
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+
+
+class LimitedTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    # Streams uploads to a temporary file, but stops writing once a file
+    # passes POST_IMAGE_MAX_SIZE. The rest of the request is still read
+    # and counted, so the file reports its real size and the form rejects
+    # it instead of silently dropping the field. Installed by
+    # limit_image_uploads() only, for views whose image fields are
+    # LimitedImageField: any other field would keep the truncated file.
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        written = self.received - len(raw_data)
+        limit = settings.POST_IMAGE_MAX_SIZE
+        if written < limit:
+            self.file.write(raw_data[:limit - written])
+
+
+def limit_image_uploads(view):
+    # Upload handlers can only be replaced before the request body is
+    # read, and CsrfViewMiddleware reads it for every POST; so the view
+    # is exempted from the middleware and checked here instead.
+    protected = csrf_protect(view)
+
+    @wraps(view)
+    @csrf_exempt
+    def wrapper(request, *args, **kwargs):
+        request.upload_handlers = [
+            MemoryFileUploadHandler(request),
+            LimitedTemporaryFileUploadHandler(request),
+        ]
+        return protected(request, *args, **kwargs)
+    return wrapper
@@ -10,6 +10,8 @@ posts_urls = [
     path('<int:post_id>/edit/', views.edit_post, name='edit_post'),
     path('<int:post_id>/delete/', views.delete_post, name='delete_post'),
 
+    path('<int:post_id>/comments/', views.post_comments,
+         name='post_comments'),
     path('<int:post_id>/comment/', views.add_comment, name='add_comment'),
     path('<int:post_id>/edit_comment/<int:comment_id>/',
          views.edit_comment, name='edit_comment'),
@@ -27,6 +29,7 @@ urlpatterns = [
     path('', views.PostListView.as_view(), name='index'),
     path('category/<slug:category_slug>/',
          views.CategoryPostsView.as_view(), name='category_posts'),
+    path('search/', views.PostSearchView.as_view(), name='search'),
     path('posts/', include(posts_urls)),
     path('profile/', include(profile_urls)),
 ]
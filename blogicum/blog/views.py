@@ -3,13 +3,22 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import transaction
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse, reverse_lazy
+from django.utils.decorators import method_decorator
 from django.views.generic import CreateView, DetailView, ListView
+from django.views.static import serve
 
-from .auxiliary import get_posts
+from .auxiliary import get_posts, paginate_comments, visible_posts_filter
+from .cache import FEED_SCOPE, cache_anonymous_page, feed_count_cache_key
 from .forms import CommentCreateForm, PostForm, UserEditForm
+from .mixins import ObjectCacheMixin
 from .models import Category, Comment, Post
+from .pagination import FeedPaginationMixin
+from .routers import read_from_replica
+from .search import search_posts
+from .uploads import limit_image_uploads
 
 
 User = get_user_model()
@@ -21,21 +30,31 @@ class RegistrationView(CreateView):
     success_url = reverse_lazy('pages:homepage')
 
 
-class UserProfileView(ListView):
+@method_decorator(cache_anonymous_page(FEED_SCOPE), name='dispatch')
+@method_decorator(read_from_replica, name='dispatch')
+class UserProfileView(ObjectCacheMixin, FeedPaginationMixin, ListView):
     model = User
     template_name = 'blog/profile.html'
     context_object_name = 'profile'
     paginate_by = settings.LIMIT_POST
 
     def get_profile(self):
-        return get_object_or_404(User, username=self.kwargs['username'])
+        return self.get_cached_object('profile', lambda: get_object_or_404(
+            User, username=self.kwargs['username']
+        ))
 
     def get_queryset(self):
         profile = self.get_profile()
         return get_posts(
             profile.posts,
-            apply_filtering=self.request.user != profile,
-            apply_annotation=True
+            apply_filtering=self.request.user != profile
+        )
+
+    def get_count_cache_key(self):
+        profile = self.get_profile()
+        is_owner = self.request.user == profile
+        return feed_count_cache_key(
+            f'count:author:{profile.pk}', 'all' if is_owner else 'published'
         )
 
     def get_context_data(self, **kwargs):
@@ -53,6 +72,7 @@ def edit_profile(request):
     return render(request, 'blog/user.html', {'form': form, })
 
 
+@method_decorator(limit_image_uploads, name='dispatch')
 class PostCreateView(LoginRequiredMixin, CreateView):
     model = Post
     template_name = 'blog/create.html'
@@ -67,58 +87,102 @@ class PostCreateView(LoginRequiredMixin, CreateView):
         return super().form_valid(form)
 
 
+def get_visible_post(user, post_id):
+    return get_object_or_404(
+        get_posts(apply_filtering=False).filter(visible_posts_filter(user)),
+        pk=post_id
+    )
+
+
+@method_decorator(cache_anonymous_page('post:{post_id}'), name='dispatch')
+@method_decorator(read_from_replica, name='dispatch')
 class PostDetailView(DetailView):
     template_name = 'blog/detail.html'
     model = Post
     pk_url_kwarg = 'post_id'
 
     def get_object(self, queryset=None):
-        base_queryset = get_posts(
-            Post.objects.all(),
-            apply_filtering=False,
-            apply_annotation=False
-        )
-        post = get_object_or_404(base_queryset, pk=self.kwargs['post_id'])
-
-        if post.author != self.request.user:
-            post = get_object_or_404(
-                get_posts(Post.objects.all(), apply_annotation=False),
-                pk=post.pk
-            )
-
-        return post
+        return get_visible_post(self.request.user, self.kwargs['post_id'])
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['comments'] = self.object.comments.select_related('author')
+        context['comments'] = paginate_comments(
+            self.object, self.request.GET.get('comments')
+        )
         context['form'] = CommentCreateForm()
         return context
 
 
-class PostListView(ListView):
+@cache_anonymous_page('post:{post_id}')
+@read_from_replica
+def post_comments(request, post_id):
+    post = get_object_or_404(
+        Post.objects.filter(visible_posts_filter(request.user)), pk=post_id
+    )
+    return render(request, 'includes/comment_list.html', {
+        'post': post,
+        'comments': paginate_comments(post, request.GET.get('cursor')),
+    })
+
+
+@method_decorator(cache_anonymous_page(FEED_SCOPE), name='dispatch')
+@method_decorator(read_from_replica, name='dispatch')
+class PostListView(FeedPaginationMixin, ListView):
     model = Post
     paginate_by = settings.LIMIT_POST
     template_name = 'blog/index.html'
-    queryset = get_posts()
+
+    def get_queryset(self):
+        return get_posts()
+
+    def get_count_cache_key(self):
+        return feed_count_cache_key('count:index')
 
 
-class CategoryPostsView(ListView):
+@method_decorator(cache_anonymous_page(FEED_SCOPE), name='dispatch')
+@method_decorator(read_from_replica, name='dispatch')
+class PostSearchView(FeedPaginationMixin, ListView):
+    model = Post
+    template_name = 'blog/search.html'
+    paginate_by = settings.LIMIT_POST
+    # Results are ordered by relevance, which cursors cannot follow.
+    pagination = 'offset'
+
+    def get_search_query(self):
+        return self.request.GET.get('q', '').strip()
+
+    def get_queryset(self):
+        return search_posts(get_posts(), self.get_search_query())
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.get_search_query()
+        return context
+
+
+@method_decorator(cache_anonymous_page(FEED_SCOPE), name='dispatch')
+@method_decorator(read_from_replica, name='dispatch')
+class CategoryPostsView(ObjectCacheMixin, FeedPaginationMixin, ListView):
     model = Post
     template_name = 'blog/category.html'
     paginate_by = settings.LIMIT_POST
 
     def fetch_category(self):
-        category_slug = self.kwargs['category_slug']
-        return get_object_or_404(
+        return self.get_cached_object('category', lambda: get_object_or_404(
             Category,
-            slug=category_slug,
+            slug=self.kwargs['category_slug'],
             is_published=True
-        )
+        ))
 
     def get_queryset(self):
         category = self.fetch_category()
         return get_posts(category.posts)
 
+    def get_count_cache_key(self):
+        return feed_count_cache_key(
+            f'count:category:{self.fetch_category().pk}'
+        )
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['category'] = self.fetch_category()
@@ -126,6 +190,7 @@ class CategoryPostsView(ListView):
 
 
 @login_required()
+@limit_image_uploads
 def edit_post(request, post_id):
     post = get_object_or_404(Post, id=post_id)
 
@@ -169,7 +234,8 @@ def add_comment(request, post_id):
         comment = form.save(commit=False)
         comment.post = post
         comment.author = request.user
-        comment.save()
+        with transaction.atomic():
+            comment.save()
     return redirect('blog:post_detail', post_id=post.id)
 
 
@@ -199,9 +265,18 @@ def delete_comment(request, post_id, comment_id):
         return redirect('blog:post_detail', post_id)
 
     if request.method == 'POST':
-        comment.delete()
+        with transaction.atomic():
+            comment.delete()
         return redirect('blog:post_detail', post_id)
 
     return render(request, 'blog/comment.html', {
         'comment': comment,
     })
+
+
+def serve_media(request, path):
+    response = serve(request, path, document_root=settings.MEDIA_ROOT)
+    response['Cache-Control'] = (
+        f'public, max-age={settings.MEDIA_CACHE_MAX_AGE}, immutable'
+    )
+    return response
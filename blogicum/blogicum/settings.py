@@ -52,12 +52,41 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'debug_toolbar.middleware.DebugToolbarMiddleware',
+    'blog.middleware.PinPrimaryMiddleware',
 ]
 
 ROOT_URLCONF = 'blogicum.urls'
 
 MEDIA_ROOT = BASE_DIR / 'media'
 
+MEDIA_URL = '/media/'
+
+# Post images are stored under their content hash and never change.
+MEDIA_CACHE_MAX_AGE = 60 * 60 * 24 * 365
+
+POST_IMAGE_MAX_SIZE = 10 * 2 ** 20
+
+# Width times height; larger images are rejected without being decoded.
+POST_IMAGE_MAX_PIXELS = 40 * 10 ** 6
+
+# Maximum widths of the downscaled copies made for every post image.
+POST_IMAGE_RENDITIONS = {
+    'card': 640,
+    'detail': 1280,
+}
+
+POST_IMAGE_QUALITY = 82
+
+# Image jobs are retried with exponential backoff starting at the delay,
+# in seconds; a job locked for longer than the timeout is taken again.
+IMAGE_JOB_MAX_ATTEMPTS = 5
+IMAGE_JOB_RETRY_DELAY = 60
+IMAGE_JOB_LOCK_TIMEOUT = 60 * 10
+
+# Seconds after its last save during which an unreferenced image is not
+# deleted, as a post reusing the same bytes may still be uncommitted.
+IMAGE_RELEASE_GRACE = 60 * 5
+
 TEMPLATES_DIR = BASE_DIR / 'templates'
 
 TEMPLATES = [
@@ -79,6 +108,30 @@ TEMPLATES = [
 WSGI_APPLICATION = 'blogicum.wsgi.application'
 
 
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blogicum',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+    # Sessions and users must look the same to every worker process, or a
+    # logout or a password change would not reach the others. Files are
+    # shared by the processes of one host; use memcached across hosts.
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+}
+
+
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
@@ -86,9 +139,47 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Seconds a connection is kept between requests: 0 closes it after
+        # each request, None keeps it forever.
+        'CONN_MAX_AGE': 60,
+        # Check a kept connection before the next request reuses it.
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Applied once to every new SQLite connection. WAL lets readers run alongside a
+# writer, and NORMAL sync is durable in WAL mode except on power loss.
+# busy_timeout is in milliseconds, a negative cache_size in KiB.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 2 ** 20,
+    'cache_size': -32 * 2 ** 10,
+    'temp_store': 'MEMORY',
+}
+
+# Aliases of read-only copies of 'default', e.g. a 'replica' entry in
+# DATABASES with 'TEST': {'MIRROR': 'default'}. Feed and post pages read
+# from them; a client that has just written is pinned to the primary for
+# REPLICA_PIN_SECONDS.
+DATABASE_REPLICAS = []
+DATABASE_ROUTERS = ['blog.routers.ReplicaRouter']
+REPLICA_PIN_SECONDS = 30
+
+
+# Sessions and users are read on every authenticated request, so both are
+# served from the shared cache. Sessions are still written through to the
+# database and outlive a cache restart; expired rows are removed by the
+# clear_expired_sessions command.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'shared'
+
+AUTHENTICATION_BACKENDS = ['blog.backends.CachedModelBackend']
+
+USER_CACHE_ALIAS = 'shared'
+USER_CACHE_TIMEOUT = 60 * 5
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -144,6 +235,30 @@ CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
 
 LIMIT_POST = 10
 
+# Comments shown per page of a post; further pages load by cursor.
+LIMIT_COMMENTS = 50
+
+# 'offset' for numbered pages, 'keyset' for cursor pagination of feeds.
+FEED_PAGINATION = 'offset'
+
+# Scheduled posts become visible at the start of the next interval of this
+# many seconds, so requests within one interval share the feed cutoff.
+PUBLICATION_CUTOFF_GRANULARITY = 60
+
+POST_CARD_CACHE_TIMEOUT = 60 * 60
+
+# Lifetime of cached feed and post pages served to anonymous visitors;
+# 0 turns the page cache off.
+PAGE_CACHE_TIMEOUT = 60 * 5
+
+FEED_COUNT_CACHE_TIMEOUT = 60 * 60
+
+# Admin changelists count exactly up to this many rows and estimate above.
+ADMIN_COUNT_ESTIMATE_THRESHOLD = 10000
+
+# Rows changed per statement by the bulk admin actions.
+ADMIN_ACTION_BATCH_SIZE = 1000
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
 
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
 from django.conf import settings
 from pages.views import RegistrationView
 
@@ -20,4 +20,10 @@ urlpatterns = [
 
 if settings.DEBUG:
     import debug_toolbar
-    urlpatterns += (path('__debug__/', include(debug_toolbar.urls)),)
+    from blog.views import serve_media
+    urlpatterns += (
+        path('__debug__/', include(debug_toolbar.urls)),
+        re_path(
+            rf'^{settings.MEDIA_URL.lstrip("/")}(?P<path>.*)$', serve_media
+        ),
+    )
@@ -18,7 +18,9 @@ from typing import (
 
 import pytest
 from django.apps import apps
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
@@ -41,6 +43,24 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True, scope='session')
+def shared_cache_location(tmp_path_factory):
+    # Keeps the tests off the file cache of a running development server.
+    shared = {
+        **settings.CACHES['shared'],
+        'LOCATION': tmp_path_factory.mktemp('cache'),
+    }
+    with override_settings(CACHES={**settings.CACHES, 'shared': shared}):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    for cache in caches.all():
+        cache.clear()
+    yield
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -92,6 +112,7 @@ pytest_plugins = [
     "fixtures.locations",
     "fixtures.categories",
     "fixtures.comments",
+    "fixtures.images",
     "adapters.comment",
 ]
 
@@ -363,6 +384,7 @@ def cleanup(request):
                     filename.endswith(".jpg")
                     or filename.endswith(".gif")
                     or filename.endswith(".png")
+                    or filename.endswith(".webp")
             ):
                 file_path = os.path.join(root, filename)
                 if os.path.getmtime(file_path) >= start_time:
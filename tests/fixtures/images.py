@@ -0,0 +1,61 @@
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+
+from blog.forms import PostForm
+from blog.models import Post
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path / 'media'
+    # Released files are deleted at once unless a test sets a grace period.
+    settings.IMAGE_RELEASE_GRACE = 0
+    return settings.MEDIA_ROOT
+
+
+@pytest.fixture
+def image_file():
+    def make(width=50, height=50, color=(73, 109, 137), name='photo.jpg',
+             exif=None):
+        image_data = BytesIO()
+        Image.new('RGB', (width, height), color).save(
+            image_data, 'JPEG', **({'exif': exif} if exif else {})
+        )
+        return SimpleUploadedFile(
+            name, image_data.getvalue(), content_type='image/jpeg'
+        )
+    return make
+
+
+@pytest.fixture
+def save_image_post(user, published_category):
+    # Saves a post through PostForm, as the create and edit views do.
+    def save(image, instance=None):
+        form = PostForm(
+            data={
+                'title': 'Пост с картинкой',
+                'text': 'Текст',
+                'pub_date': '2020-01-01T12:00',
+                'category': published_category.id,
+                'is_published': True,
+            },
+            files={'image': image} if image else {},
+            instance=instance or Post(author=user),
+        )
+        assert form.is_valid(), form.errors
+        return form.save()
+    return save
+
+
+@pytest.fixture
+def run_image_worker():
+    def run():
+        call_command(
+            'process_image_jobs', '--once',
+            stdout=StringIO(), stderr=StringIO()
+        )
+    return run
@@ -0,0 +1,96 @@
+import pytest
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Category, Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts(settings, mixer, published_category):
+    settings.ADMIN_ACTION_BATCH_SIZE = 2
+    return mixer.cycle(5).blend(
+        'blog.Post', category=published_category, is_published=True,
+        image=None
+    )
+
+
+def run_action(admin_client, model, action, selected=None, **data):
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.post(f'/admin/blog/{model}/', {
+            'action': action,
+            'index': 0,
+            # Select all, as the changelist sends it, unless pks are given.
+            ACTION_CHECKBOX_NAME: selected or [Post.objects.first().pk],
+            'select_across': 0 if selected else 1,
+            **data,
+        }, follow=True)
+    assert response.status_code == 200
+    return response, [q['sql'] for q in queries]
+
+
+def messages(response):
+    return [str(message) for message in response.context['messages']]
+
+
+def test_unpublish_all_runs_batched_updates(admin_client, posts, client):
+    assert len(client.get('/').context['page_obj']) == 5
+    response, queries = run_action(admin_client, 'post', 'unpublish')
+    updates = [sql for sql in queries if sql.startswith('UPDATE "blog_post"')]
+    assert len(updates) == 3, (
+        'Убедитесь, что публикации обновляются пакетными UPDATE.'
+    )
+    assert 'Снято с публикации: 5.' in messages(response)
+    assert not Post.objects.filter(is_published=True).exists()
+    assert len(client.get('/').context['page_obj']) == 0, (
+        'Убедитесь, что после массового действия сбрасывается кэш.'
+    )
+
+    run_action(admin_client, 'post', 'publish', [posts[0].pk])
+    assert list(Post.objects.filter(is_published=True)) == [posts[0]]
+
+
+def test_change_category(admin_client, posts, mixer):
+    category = mixer.blend('blog.Category')
+    response, _ = run_action(
+        admin_client, 'post', 'change_category',
+        [posts[0].pk, posts[1].pk], category=category.pk
+    )
+    assert 'Перенесено: 2.' in messages(response)
+    assert set(category.posts.all()) == {posts[0], posts[1]}
+
+    response, _ = run_action(
+        admin_client, 'post', 'change_category', [posts[2].pk]
+    )
+    assert 'Выберите категорию.' in messages(response)
+
+
+def test_delete_posts_with_confirmation(admin_client, posts, mixer):
+    mixer.cycle(3).blend('blog.Comment', post=posts[0])
+    response, _ = run_action(
+        admin_client, 'post', 'delete_selected_in_batches'
+    )
+    assert 'Удалить публикации: 5?' in response.content.decode('utf-8')
+    assert Post.objects.count() == 5
+
+    response, queries = run_action(
+        admin_client, 'post', 'delete_selected_in_batches', post='yes'
+    )
+    assert 'Удалено: 5.' in messages(response)
+    assert not Post.objects.exists() and not Comment.objects.exists()
+    assert not [sql for sql in queries if 'FROM "blog_comment"' in sql
+                and sql.startswith('SELECT')], (
+        'Убедитесь, что удаление не загружает связанные объекты.'
+    )
+
+
+def test_delete_categories_keeps_posts(admin_client, posts):
+    category = posts[0].category
+    run_action(
+        admin_client, 'category', 'delete_selected_in_batches',
+        [category.pk], post='yes'
+    )
+    assert not Category.objects.filter(pk=category.pk).exists()
+    assert Post.objects.filter(category=None).count() == 5
@@ -0,0 +1,46 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def changelist(admin_client, **params):
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get('/admin/blog/post/', params)
+    assert response.status_code == 200
+    counts = [q['sql'] for q in queries if 'COUNT(' in q['sql']]
+    return response, counts
+
+
+@pytest.fixture
+def posts(settings, mixer, published_category):
+    settings.ADMIN_COUNT_ESTIMATE_THRESHOLD = 5
+    published = mixer.cycle(7).blend(
+        'blog.Post', category=published_category, is_published=True,
+        image=None
+    )
+    mixer.cycle(2).blend('blog.Post', is_published=False, image=None)
+    return published
+
+
+def test_counts_are_capped(admin_client, posts):
+    response, counts = changelist(admin_client)
+    assert counts and all('LIMIT 6' in sql for sql in counts), (
+        'Убедитесь, что в админке публикаций нет полного COUNT(*).'
+    )
+    assert response.context['cl'].full_result_count is None
+
+
+def test_unfiltered_count_estimated_from_statistics(admin_client, posts):
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE blog_post')
+    response, _ = changelist(admin_client)
+    assert response.context['cl'].result_count == 9
+    assert '≈ 9' in response.content.decode('utf-8')
+
+
+def test_small_filtered_count_exact(admin_client, posts):
+    response, _ = changelist(admin_client, is_published__exact=0)
+    assert response.context['cl'].result_count == 2
+    assert '≈' not in response.content.decode('utf-8')
@@ -0,0 +1,62 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def changelist(admin_client, **params):
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get('/admin/blog/comment/', params)
+    assert response.status_code == 200
+    return set(response.context['cl'].result_list), queries
+
+
+@pytest.fixture
+def comments(mixer, user, another_user):
+    posts = mixer.cycle(2).blend(
+        'blog.Post', title=(t for t in ('Горы', 'Море')), image=None
+    )
+    return [
+        mixer.blend('blog.Comment', post=posts[0], author=user),
+        mixer.blend('blog.Comment', post=posts[1], author=another_user),
+    ]
+
+
+def test_filters_do_not_load_related_tables(admin_client, mixer, comments):
+    # The first request also caches the logged-in user.
+    changelist(admin_client)
+    _, queries = changelist(admin_client)
+    mixer.cycle(20).blend('blog.Post', image=None)
+    mixer.cycle(20).blend('auth.User')
+    _, more_queries = changelist(admin_client)
+    assert len(more_queries) == len(queries)
+    assert not [
+        query['sql'] for query in more_queries
+        if query['sql'].startswith('SELECT')
+        and ('FROM "blog_post"' in query['sql']
+             or 'FROM "auth_user" ORDER' in query['sql'])
+    ], 'Убедитесь, что фильтры не загружают всех авторов и все публикации.'
+
+
+def test_author_and_post_filters(admin_client, user, comments):
+    first, second = comments
+    assert changelist(admin_client, author=user.username)[0] == {first}
+    assert changelist(admin_client, post=second.post_id)[0] == {second}
+    assert changelist(admin_client, post='мор')[0] == {second}
+    assert changelist(
+        admin_client, author=user.username, post='мор'
+    )[0] == set()
+
+
+def test_forms_use_autocomplete(admin_client, comments):
+    for url in ('/admin/blog/comment/add/', '/admin/blog/post/add/'):
+        content = admin_client.get(url).content.decode('utf-8')
+        assert 'admin-autocomplete' in content
+    response = admin_client.get('/admin/autocomplete/', {
+        'term': 'мор', 'app_label': 'blog', 'model_name': 'comment',
+        'field_name': 'post',
+    })
+    assert [result['id'] for result in response.json()['results']] == [
+        str(comments[1].post_id)
+    ]
@@ -0,0 +1,78 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.admin import CommentAdmin
+from blog.models import Comment
+
+pytestmark = [pytest.mark.django_db]
+
+
+def admin_search(admin_client, model, query):
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(f'/admin/blog/{model}/', {'q': query})
+    assert response.status_code == 200
+    assert not [q['sql'] for q in queries if 'LIKE' in q['sql']], (
+        'Убедитесь, что поиск в админке не сканирует таблицу через LIKE.'
+    )
+    return set(response.context['cl'].result_list)
+
+
+@pytest.fixture
+def comments(mixer, user, another_user, post_with_published_location):
+    post = post_with_published_location
+    post.title = 'Путешествие на велосипеде'
+    post.save()
+    other_post = mixer.blend('blog.Post', title='Рыбалка', image=None)
+    return {
+        'bike': mixer.blend(
+            'blog.Comment', post=other_post, author=user,
+            text='Отличный велосипед'
+        ),
+        'on_bike_post': mixer.blend(
+            'blog.Comment', post=post, author=user, text='Согласен'
+        ),
+        'by_another': mixer.blend(
+            'blog.Comment', post=other_post, author=another_user,
+            text='Без слов'
+        ),
+    }
+
+
+def test_comment_search_by_text_author_and_post(admin_client, comments):
+    assert admin_search(admin_client, 'comment', 'велосипед') == {
+        comments['bike'], comments['on_bike_post']
+    }
+    username = comments['by_another'].author.username
+    assert admin_search(admin_client, 'comment', username) == {
+        comments['by_another']
+    }
+
+
+def test_comment_search_uses_indexes(rf, admin_user, comments):
+    admin = CommentAdmin(Comment, None)
+    queryset, _ = admin.get_search_results(
+        rf.get('/'), Comment.objects.all(), 'велосипед'
+    )
+    plan = queryset.explain()
+    assert not [
+        line for line in plan.splitlines()
+        if line.endswith('SCAN blog_comment')
+    ], plan
+
+
+def test_post_and_category_search(
+        admin_client, mixer, published_category, post_with_published_location):
+    post = post_with_published_location
+    post.text = 'Длинный рассказ о горах'
+    post.save()
+    assert admin_search(admin_client, 'post', 'гора') == {post}
+    published_category.description = 'Всё про горные походы'
+    published_category.save()
+    assert admin_search(admin_client, 'category', 'горн') == {
+        published_category
+    }
+    assert admin_search(
+        admin_client, 'category', published_category.slug
+    ) == {published_category}
+    assert admin_search(admin_client, 'post', '"*') == set()
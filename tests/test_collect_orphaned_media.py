@@ -0,0 +1,143 @@
+import os
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from blog.images import process_post_image
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def renditions(settings):
+    settings.POST_IMAGE_RENDITIONS = {'card': 20}
+
+
+@pytest.fixture
+def media(mixer, user, media_root, image_file):
+    post = mixer.blend('blog.Post', author=user, image=None)
+    post.image.save('kept.jpg', image_file(color='red'))
+    process_post_image(post)
+    orphans = []
+    for name in ('posts_images/old.jpg', 'posts_images/ab/orphan.jpg',
+                 'posts_images/renditions/legacy_card.jpg'):
+        path = media_root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b'orphan')
+        orphans.append(path)
+    kept = [media_root / post.image.name] + [
+        media_root / rendition[key]
+        for rendition in post.image_renditions['sizes'].values()
+        for key in ('jpeg', 'webp')
+    ]
+    for path in kept + orphans:
+        os.utime(path, (0, 0))
+    return kept, orphans
+
+
+def collect(*args, batch_size=2):
+    stdout = StringIO()
+    call_command(
+        'collect_orphaned_media', '--batch-size', str(batch_size), *args,
+        stdout=stdout, stderr=StringIO()
+    )
+    return stdout.getvalue()
+
+
+def test_dry_run_lists_orphans_only(media, media_root):
+    kept, orphans = media
+    output = collect('--dry-run')
+    for path in orphans:
+        assert path.relative_to(media_root).as_posix() in output
+        assert path.exists()
+    for path in kept:
+        assert path.relative_to(media_root).as_posix() not in output
+
+
+def test_orphans_deleted(media):
+    kept, orphans = media
+    collect()
+    assert all(path.exists() for path in kept), (
+        'Убедитесь, что файлы, на которые ссылаются публикации, не удаляются.'
+    )
+    assert not any(path.exists() for path in orphans)
+
+
+def test_orphans_quarantined(media, media_root, tmp_path):
+    _, orphans = media
+    collect('--quarantine', str(tmp_path / 'quarantine'))
+    for path in orphans:
+        assert not path.exists()
+        name = path.relative_to(media_root)
+        assert (tmp_path / 'quarantine' / name).exists()
+
+
+def test_recent_files_skipped(media):
+    _, orphans = media
+    os.utime(orphans[0])
+    collect()
+    assert orphans[0].exists() and not orphans[1].exists()
+
+
+def test_renditions_traced_wherever_original_lives(
+        mixer, user, media_root, image_file):
+    post = mixer.blend('blog.Post', author=user, image=None)
+    post.image.save('photo.jpg', image_file(color='green'))
+    process_post_image(post)
+    # An original stored one directory deeper than usual.
+    moved = f'posts_images/ab/{post.image.name.split("/", 1)[1]}'
+    (media_root / moved).parent.mkdir(parents=True)
+    (media_root / post.image.name).rename(media_root / moved)
+    Post.objects.filter(pk=post.pk).update(
+        image=moved,
+        image_renditions={**post.image_renditions, 'source': moved},
+    )
+    for path in media_root.rglob('*.*'):
+        os.utime(path, (0, 0))
+    output = collect('--dry-run')
+    for rendition in post.image_renditions['sizes']['card'].values():
+        if isinstance(rendition, str):
+            assert rendition not in output, (
+                'Убедитесь, что копии изображения не считаются лишними, где'
+                ' бы ни лежал исходный файл.'
+            )
+
+
+def test_many_rendition_digests_in_one_batch(media_root):
+    directory = media_root / 'posts_images' / 'renditions'
+    directory.mkdir(parents=True)
+    for number in range(1200):
+        path = directory / f'{number:064x}_20q82.jpg'
+        path.write_bytes(b'orphan')
+        os.utime(path, (0, 0))
+    output = collect('--dry-run', batch_size=1200)
+    assert 'Найдено файлов: 1200' in output
+
+
+def test_many_names_in_one_batch(mixer, user, media_root):
+    directory = media_root / 'posts_images' / 'ab'
+    directory.mkdir(parents=True)
+    for number in range(1200):
+        path = directory / f'{number:064x}.jpg'
+        path.write_bytes(b'image')
+        os.utime(path, (0, 0))
+    kept = [f'posts_images/ab/{number:064x}.jpg' for number in (7, 1100)]
+    for name in kept:
+        mixer.blend('blog.Post', author=user, image=name)
+    parameters = []
+
+    def count_parameters(execute, sql, params, many, context):
+        parameters.append(len(params or ()))
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count_parameters):
+        output = collect('--dry-run', batch_size=1200)
+    assert 'Найдено файлов: 1198' in output
+    assert not any(name in output for name in kept)
+    assert max(parameters) <= 999, (
+        'Убедитесь, что ни один запрос не передаёт больше 999 параметров:'
+        ' это предел старых версий SQLite.'
+    )
@@ -0,0 +1,75 @@
+import pytest
+from django.core.management import CommandError, call_command
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_comment_views(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    for text in ('Первый', 'Второй'):
+        user_client.post(f'/posts/{post.id}/comment/', {'text': text})
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        'Убедитесь, что при добавлении комментария увеличивается счётчик'
+        ' `comment_count` публикации.'
+    )
+
+    comment = Comment.objects.filter(post=post).first()
+    user_client.post(f'/posts/{post.id}/delete_comment/{comment.id}/')
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        'Убедитесь, что при удалении комментария уменьшается счётчик'
+        ' `comment_count` публикации.'
+    )
+
+
+def test_feed_reads_stored_comment_count(
+        user_client, comment_to_a_post, post_with_published_location):
+    post = post_with_published_location
+    response = user_client.get('/')
+    feed_post = next(p for p in response.context['page_obj'] if p == post)
+    assert feed_post.comment_count == 1
+
+
+def test_recount_comments_command(comment_to_a_post,
+                                  post_with_published_location):
+    post = post_with_published_location
+    Post.objects.filter(pk=post.pk).update(comment_count=7)
+
+    with pytest.raises(CommandError):
+        call_command('recount_comments', '--check')
+
+    call_command('recount_comments', '--batch-size', '1')
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        'Убедитесь, что команда `recount_comments` восстанавливает'
+        ' правильные значения счётчиков.'
+    )
+    call_command('recount_comments', '--check')
+
+
+def test_saving_stale_post_keeps_comment_count(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    user_client.post(f'/posts/{post.id}/comment/', {'text': 'Комментарий'})
+
+    post.title = 'Изменённый заголовок'
+    post.save()
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        'Убедитесь, что сохранение публикации не затирает счётчик'
+        ' комментариев устаревшим значением.'
+    )
+
+
+def test_saving_post_with_deleted_row_inserts_it(post_with_published_location):
+    post = post_with_published_location
+    type(post).objects.filter(pk=post.pk).delete()
+    post.save()
+    assert type(post).objects.filter(pk=post.pk).exists(), (
+        'Убедитесь, что сохранение публикации, строка которой удалена,'
+        ' снова создаёт её, как обычный save().'
+    )
@@ -0,0 +1,78 @@
+import re
+from urllib.parse import unquote
+
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def post_with_comments(mixer, post_with_published_location):
+    post = post_with_published_location
+    comments = mixer.cycle(5).blend(
+        'blog.Comment', post=post, text=(f'Комментарий {i}' for i in range(5))
+    )
+    return post, comments
+
+
+def next_comments_cursor(content, param):
+    match = re.search(rf'\?{param}=([^"]+)"', content)
+    assert match, (
+        'Убедитесь, что на странице есть ссылка на следующие комментарии.'
+    )
+    return unquote(match.group(1))
+
+
+def test_detail_shows_first_page_of_comments(
+        settings, client, post_with_comments):
+    settings.LIMIT_COMMENTS = 2
+    post, comments = post_with_comments
+    response = client.get(f'/posts/{post.id}/')
+    page = response.context['comments']
+    assert [comment.id for comment in page] == [
+        comment.id for comment in comments[:2]
+    ], (
+        'Убедитесь, что на странице публикации выводится только первая'
+        ' страница комментариев, от старых к новым.'
+    )
+    content = response.content.decode('utf-8')
+    assert 'Комментарий 2' not in content
+
+    cursor = next_comments_cursor(content, 'comments')
+    page = client.get(
+        f'/posts/{post.id}/', {'comments': cursor}
+    ).context['comments']
+    assert [comment.id for comment in page] == [
+        comment.id for comment in comments[2:4]
+    ]
+
+
+def test_comment_fragment_loads_further_pages(
+        settings, client, post_with_comments):
+    settings.LIMIT_COMMENTS = 2
+    post, comments = post_with_comments
+    content = client.get(f'/posts/{post.id}/').content.decode('utf-8')
+    seen = []
+    cursor = next_comments_cursor(content, 'cursor')
+    while cursor:
+        response = client.get(
+            f'/posts/{post.id}/comments/', {'cursor': cursor}
+        )
+        assert response.status_code == 200
+        fragment = response.content.decode('utf-8')
+        assert '<html' not in fragment and '<form' not in fragment, (
+            'Убедитесь, что следующие страницы комментариев отдаются'
+            ' фрагментом без остальной разметки страницы.'
+        )
+        seen += [comment.id for comment in response.context['comments']]
+        cursor = response.context['comments'].next_cursor
+    assert seen == [comment.id for comment in comments[2:]]
+
+
+def test_comment_fragment_hidden_for_unpublished_post(
+        client, user_client, post_with_comments):
+    post, _ = post_with_comments
+    post.is_published = False
+    post.save()
+    assert client.get(f'/posts/{post.id}/comments/').status_code == 404
+    assert user_client.get(f'/posts/{post.id}/comments/').status_code == 200
@@ -0,0 +1,42 @@
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+
+from blog.signals import check_connection_health
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.mark.parametrize('health_checks', [True, False])
+def test_unusable_connection_closed_before_request(
+        health_checks, monkeypatch):
+    connection.ensure_connection()
+    closed = []
+    monkeypatch.setitem(
+        connection.settings_dict, 'CONN_HEALTH_CHECKS', health_checks
+    )
+    monkeypatch.setattr(connection, 'is_usable', lambda: False)
+    monkeypatch.setattr(connection, 'close', lambda: closed.append(True))
+    check_connection_health(sender=None)
+    assert bool(closed) == health_checks, (
+        'Убедитесь, что перед запросом неработающее постоянное соединение'
+        ' закрывается, только если включена проверка CONN_HEALTH_CHECKS.'
+    )
+
+
+def test_bench_connections_reports_both_modes(
+        capsys, post_with_published_location):
+    call_command(
+        'bench_connections', '--requests', '2', '--host', 'testserver'
+    )
+    output = capsys.readouterr().out
+    assert 'Новое соединение' in output
+    assert 'Постоянное соединение' in output
+
+
+def test_bench_connections_stops_on_error():
+    with pytest.raises(CommandError):
+        call_command(
+            'bench_connections', '--requests', '2', '--host', 'testserver',
+            '--path', '/posts/0/'
+        )
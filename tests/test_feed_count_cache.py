@@ -0,0 +1,93 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_count_and_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    count_queries = [
+        query['sql'] for query in queries if 'COUNT(' in query['sql']
+    ]
+    return response.context['paginator'].count, count_queries
+
+
+def test_feed_counts_are_cached(
+        user, user_client, another_user_client,
+        many_posts_with_published_locations):
+    category = many_posts_with_published_locations[0].category
+    for client, url in (
+        (user_client, '/'),
+        (user_client, f'/category/{category.slug}/'),
+        (user_client, f'/profile/{user.username}/'),
+        (another_user_client, f'/profile/{user.username}/'),
+    ):
+        count, count_queries = get_count_and_queries(client, url)
+        assert len(count_queries) == 1
+        cached_count, count_queries = get_count_and_queries(client, url)
+        assert not count_queries and cached_count == count, (
+            f'Убедитесь, что число публикаций ленты `{url}` берётся из'
+            ' кэша при повторном запросе.'
+        )
+
+
+def test_feed_count_invalidated_on_unpublish(
+        user, user_client, another_user_client,
+        many_posts_with_published_locations):
+    posts = many_posts_with_published_locations
+    category = posts[0].category
+    urls = ('/', f'/category/{category.slug}/', f'/profile/{user.username}/')
+    before = {
+        url: get_count_and_queries(another_user_client, url)[0]
+        for url in urls
+    }
+    owner_before = get_count_and_queries(
+        user_client, f'/profile/{user.username}/'
+    )[0]
+
+    posts[0].is_published = False
+    posts[0].save()
+
+    for url in urls:
+        assert get_count_and_queries(another_user_client, url)[0] == (
+            before[url] - 1
+        ), (
+            f'Убедитесь, что число публикаций ленты `{url}` пересчитывается'
+            ' после снятия публикации.'
+        )
+    assert get_count_and_queries(
+        user_client, f'/profile/{user.username}/'
+    )[0] == owner_before, (
+        'Убедитесь, что автор по-прежнему видит в счётчике свои снятые с'
+        ' публикации посты.'
+    )
+
+
+def test_feed_counts_follow_moved_post(
+        mixer, another_user_client, django_assert_num_queries,
+        many_posts_with_published_locations):
+    posts = many_posts_with_published_locations
+    old_category = posts[0].category
+    new_category = mixer.blend('blog.Category', is_published=True)
+    old_url = f'/category/{old_category.slug}/'
+    new_url = f'/category/{new_category.slug}/'
+    old_count = get_count_and_queries(another_user_client, old_url)[0]
+    new_count = get_count_and_queries(another_user_client, new_url)[0]
+
+    post = type(posts[0]).objects.get(pk=posts[0].pk)
+    post.category = new_category
+    # The previous category and author are read in a single query.
+    with django_assert_num_queries(2):
+        post.save()
+
+    assert get_count_and_queries(another_user_client, old_url)[0] == (
+        old_count - 1
+    ), (
+        'Убедитесь, что число публикаций категории, из которой перенесли'
+        ' публикацию, пересчитывается.'
+    )
+    assert get_count_and_queries(another_user_client, new_url)[0] == (
+        new_count + 1
+    )
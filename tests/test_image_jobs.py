@@ -0,0 +1,117 @@
+import pytest
+from PIL import Image
+
+from blog.jobs import claim_next_job, run_job
+from blog.models import ImageJob, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def renditions(settings, media_root):
+    settings.POST_IMAGE_RENDITIONS = {'card': 100}
+
+
+def test_upload_enqueues_job_instead_of_processing(
+        save_image_post, image_file, run_image_worker):
+    post = save_image_post(image_file(300, 200))
+    assert post.image_renditions == {}, (
+        'Убедитесь, что изображение обрабатывается не в запросе, а в очереди.'
+    )
+    job = ImageJob.objects.get(post=post)
+    assert (job.status, job.image) == (ImageJob.PENDING, post.image.name)
+
+    run_image_worker()
+    job.refresh_from_db()
+    post.refresh_from_db()
+    assert job.status == ImageJob.DONE
+    assert post.image_renditions['sizes']['card']['width'] == 100
+
+
+def test_worker_strips_exif(
+        save_image_post, image_file, run_image_worker, media_root):
+    exif = Image.Exif()
+    exif[0x010F] = 'Camera maker'
+    post = save_image_post(image_file(300, 200, exif=exif))
+    run_image_worker()
+    post.refresh_from_db()
+    with Image.open(media_root / post.image.name) as image:
+        assert not image.getexif()
+        assert image.size == (300, 200)
+    directory, shard, filename = post.image.name.split('/')
+    assert directory == 'posts_images' and filename.startswith(shard), (
+        'Убедитесь, что очищенное от EXIF изображение хранится в той же'
+        ' структуре каталогов, что и загруженное.'
+    )
+    assert post.image_renditions['source'] == post.image.name
+    card = post.image_renditions['sizes']['card']['jpeg']
+    assert (media_root / card).exists()
+
+
+def test_failed_job_retried_with_backoff(
+        save_image_post, image_file, monkeypatch, settings):
+    settings.IMAGE_JOB_MAX_ATTEMPTS = 2
+    post = save_image_post(image_file(300, 200))
+
+    def broken(post):
+        raise OSError('диск недоступен')
+
+    monkeypatch.setattr('blog.jobs.process_post_image', broken)
+    assert not run_job(claim_next_job())
+    job = ImageJob.objects.get(post=post)
+    assert job.status == ImageJob.PENDING and 'диск' in job.last_error
+    assert claim_next_job() is None, (
+        'Убедитесь, что повторная попытка откладывается.'
+    )
+
+    ImageJob.objects.update(run_after=job.created_at)
+    assert not run_job(claim_next_job())
+    job.refresh_from_db()
+    assert (job.status, job.attempts) == (ImageJob.FAILED, 2)
+
+
+def test_superseded_job_skipped(
+        save_image_post, image_file, run_image_worker):
+    post = save_image_post(image_file(300, 200))
+    Post.objects.filter(pk=post.pk).update(image='posts_images/other.jpg')
+    run_image_worker()
+    post.refresh_from_db()
+    assert ImageJob.objects.get(post=post).status == ImageJob.DONE
+    assert post.image_renditions == {}
+
+
+def test_job_does_not_overwrite_newer_upload(
+        save_image_post, image_file, run_image_worker, media_root):
+    exif = Image.Exif()
+    exif[0x010F] = 'Camera maker'
+    post = save_image_post(image_file(300, 200, exif=exif))
+    job = claim_next_job()
+    newer = save_image_post(
+        image_file(300, 200, color='red', name='new.jpg'),
+        instance=Post.objects.get(pk=post.pk),
+    )
+    assert run_job(job)
+    post.refresh_from_db()
+    assert post.image.name == newer.image.name, (
+        'Убедитесь, что обработка старого изображения не затирает'
+        ' загруженное позже.'
+    )
+    assert (media_root / newer.image.name).exists()
+
+    run_image_worker()
+    post.refresh_from_db()
+    assert post.image_renditions['source'] == newer.image.name
+    assert set(ImageJob.objects.values_list('status', flat=True)) == {
+        ImageJob.DONE
+    }
+
+
+def test_job_of_deleted_post_superseded(save_image_post, image_file):
+    post = save_image_post(image_file(300, 200))
+    job = claim_next_job()
+    post.delete()
+    assert run_job(job), (
+        'Убедитесь, что удаление поста во время обработки не роняет'
+        ' обработчик очереди.'
+    )
+    assert not ImageJob.objects.exists()
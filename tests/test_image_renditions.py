@@ -0,0 +1,83 @@
+import pytest
+from PIL import Image
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def renditions(settings, media_root):
+    settings.POST_IMAGE_RENDITIONS = {'card': 300, 'detail': 600}
+
+
+@pytest.fixture
+def save_post_form(save_image_post, run_image_worker):
+    def save(image, instance=None):
+        post = save_image_post(image, instance)
+        run_image_worker()
+        post.refresh_from_db()
+        return post
+    return save
+
+
+def test_renditions_generated_on_upload(
+        save_post_form, image_file, media_root):
+    post = save_post_form(image_file(1200, 800))
+    sizes = post.image_renditions['sizes']
+    assert post.image_renditions['source'] == post.image.name
+    assert (sizes['card']['width'], sizes['card']['height']) == (300, 200)
+    assert (sizes['detail']['width'], sizes['detail']['height']) == (600, 400)
+    for rendition in sizes.values():
+        for name in (rendition['jpeg'], rendition['webp']):
+            assert (media_root / name).stat().st_size < post.image.size
+    with Image.open(media_root / sizes['card']['webp']) as webp:
+        assert webp.format == 'WEBP'
+
+
+def test_small_images_not_enlarged(save_post_form, image_file):
+    post = save_post_form(image_file(100, 50))
+    for rendition in post.image_renditions['sizes'].values():
+        assert (rendition['width'], rendition['height']) == (100, 50)
+
+
+def test_feed_serves_card_rendition(save_post_form, image_file, client):
+    post = save_post_form(image_file(1200, 800))
+    content = client.get('/').content.decode('utf-8')
+    card = post.image_renditions['sizes']['card']
+    assert f'src="{post.image.storage.url(card["jpeg"])}"' in content
+    assert 'width="300" height="200"' in content
+    assert 'type="image/webp"' in content and card['webp'] in content
+    assert f'src="{post.image.url}"' not in content, (
+        'Убедитесь, что в ленте выводится уменьшенная копия изображения.'
+    )
+    detail = client.get(f'/posts/{post.id}/').content.decode('utf-8')
+    assert post.image_renditions['sizes']['detail']['jpeg'] in detail
+
+
+def test_replaced_image_renditions_rebuilt(
+        save_post_form, image_file, media_root,
+        django_capture_on_commit_callbacks):
+    post = save_post_form(image_file(1200, 800))
+    old_files = [
+        media_root / rendition[key]
+        for rendition in post.image_renditions['sizes'].values()
+        for key in ('jpeg', 'webp')
+    ]
+    with django_capture_on_commit_callbacks(execute=True):
+        post = save_post_form(
+            image_file(900, 900, name='new.jpg'),
+            instance=Post.objects.get(pk=post.pk)
+        )
+    assert post.image_renditions['source'] == post.image.name
+    assert post.image_renditions['sizes']['card']['height'] == 300
+    assert not any(path.exists() for path in old_files), (
+        'Убедитесь, что копии заменённого изображения удаляются.'
+    )
+
+
+def test_original_served_without_renditions(
+        client, post_with_published_location):
+    post = post_with_published_location
+    content = client.get('/').content.decode('utf-8')
+    assert f'src="{post.image.url}"' in content
@@ -0,0 +1,73 @@
+import pytest
+from django.db import connection
+
+from blog.auxiliary import get_posts
+from blog.models import Comment, Post
+from blog.pagination import FEED_ORDERING
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != 'sqlite',
+        reason='Планы запросов проверяются для SQLite.'
+    ),
+]
+
+
+def assert_uses_index(queryset, index_name, query_name):
+    plan = queryset.explain()
+    assert f'USING INDEX {index_name}' in plan, (
+        f'Убедитесь, что запрос «{query_name}» использует индекс'
+        f' `{index_name}`. План запроса:\n{plan}'
+    )
+    assert 'TEMP B-TREE' not in plan, (
+        f'Убедитесь, что запрос «{query_name}» не сортирует строки во'
+        f' временном B-дереве. План запроса:\n{plan}'
+    )
+
+
+def test_published_feed_uses_index():
+    assert_uses_index(
+        get_posts()[:10], 'post_published_feed_idx', 'главная лента'
+    )
+    assert_uses_index(
+        get_posts().order_by(*FEED_ORDERING)[:10],
+        'post_published_feed_idx',
+        'главная лента с курсорной пагинацией'
+    )
+
+
+def test_category_feed_uses_index(published_category):
+    assert_uses_index(
+        get_posts(published_category.posts)[:10],
+        'post_category_feed_idx',
+        'лента категории'
+    )
+
+
+def test_author_feed_uses_index(user):
+    assert_uses_index(
+        get_posts(user.posts)[:10],
+        'post_author_feed_idx',
+        'лента автора для читателя'
+    )
+    assert_uses_index(
+        get_posts(user.posts, apply_filtering=False)[:10],
+        'post_author_feed_idx',
+        'лента автора для самого автора'
+    )
+
+
+def test_post_comments_use_index(post_with_published_location):
+    assert_uses_index(
+        Comment.objects.filter(post=post_with_published_location),
+        'comment_post_created_idx',
+        'комментарии к публикации'
+    )
+
+
+def test_post_ordering_matches_feed_index():
+    assert tuple(Post._meta.ordering) == FEED_ORDERING, (
+        'Убедитесь, что сортировка публикаций по умолчанию совпадает с'
+        ' порядком ключей курсорной пагинации и индексов ленты.'
+    )
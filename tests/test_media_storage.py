@@ -0,0 +1,105 @@
+import os
+
+import pytest
+
+from blog.images import release_image
+from blog.models import Post
+from blog.storage import HashedFileSystemStorage
+from blog.views import serve_media
+
+pytestmark = [pytest.mark.django_db]
+
+
+def create_post(mixer, user, content, name='photo.JPG'):
+    post = mixer.blend('blog.Post', author=user, image=None)
+    post.image.save(name, content)
+    return post
+
+
+def test_names_are_content_hashes(media_root, image_file):
+    storage = HashedFileSystemStorage()
+    first = storage.save('posts_images/a.JPG', image_file(color='red'))
+    second = storage.save('posts_images/b.jpg', image_file(color='red'))
+    other = storage.save('posts_images/a.JPG', image_file(color='blue'))
+    assert first == second != other, (
+        'Убедитесь, что одинаковые файлы хранятся один раз.'
+    )
+    directory, shard, filename = first.split('/')
+    assert directory == 'posts_images' and filename.endswith('.jpg')
+    assert filename.startswith(shard) and len(filename) == 64 + 4
+    assert len(list(media_root.glob('posts_images/*/*.jpg'))) == 2
+
+
+def test_shared_image_kept_until_last_post_deleted(
+        mixer, user, media_root, image_file,
+        django_capture_on_commit_callbacks):
+    first = create_post(mixer, user, image_file(color='red'))
+    second = create_post(mixer, user, image_file(color='red'), 'copy.jpg')
+    path = media_root / first.image.name
+    assert first.image.name == second.image.name
+
+    with django_capture_on_commit_callbacks(execute=True):
+        first.delete()
+    assert path.exists()
+    with django_capture_on_commit_callbacks(execute=True):
+        second.delete()
+    assert not path.exists(), (
+        'Убедитесь, что файл удаляется вместе с последней публикацией,'
+        ' которая на него ссылается.'
+    )
+
+
+def test_replaced_image_released(
+        mixer, user, media_root, image_file,
+        django_capture_on_commit_callbacks):
+    post = create_post(mixer, user, image_file(color='red'))
+    old_path = media_root / post.image.name
+    with django_capture_on_commit_callbacks(execute=True):
+        post.image.save('new.jpg', image_file(color='blue'))
+    assert not old_path.exists()
+    assert (media_root / Post.objects.get(pk=post.pk).image.name).exists()
+
+
+def test_media_served_as_immutable(rf, mixer, user, media_root, image_file):
+    post = create_post(mixer, user, image_file(color='red'))
+    response = serve_media(rf.get('/'), post.image.name)
+    assert response.status_code == 200
+    assert 'immutable' in response['Cache-Control']
+
+
+def test_concurrent_save_reuses_name(media_root, image_file, monkeypatch):
+    storage = HashedFileSystemStorage()
+    name = storage.save('posts_images/a.jpg', image_file(color='red'))
+
+    def missing(name):
+        raise FileNotFoundError(name)
+
+    # As if another process wrote the file right after this one looked.
+    monkeypatch.setattr(storage, 'touch', missing)
+    assert storage.save('posts_images/b.jpg', image_file(color='red')) == name
+    assert len(list(media_root.glob('posts_images/*/*'))) == 1, (
+        'Убедитесь, что одновременное сохранение одинаковых файлов не'
+        ' создаёт их копий под случайными именами.'
+    )
+
+
+def test_reused_file_kept_during_grace_period(
+        settings, mixer, user, media_root, image_file):
+    settings.IMAGE_RELEASE_GRACE = 60
+    post = create_post(mixer, user, image_file(color='red'))
+    name = post.image.name
+    os.utime(media_root / name, (0, 0))
+    Post.objects.filter(pk=post.pk).delete()
+    # An upload of the same bytes whose post is not committed yet.
+    assert post.image.storage.save(
+        'posts_images/photo.jpg', image_file(color='red')
+    ) == name
+    release_image(post.image.storage, name, {})
+    assert (media_root / name).exists(), (
+        'Убедитесь, что только что сохранённый файл не удаляется, пока'
+        ' публикация, которая его использует, может быть ещё не сохранена.'
+    )
+
+    settings.IMAGE_RELEASE_GRACE = 0
+    release_image(post.image.storage, name, {})
+    assert not (media_root / name).exists()
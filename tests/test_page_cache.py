@@ -0,0 +1,86 @@
+import pytest
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_content(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return response.content.decode('utf-8')
+
+
+def test_anonymous_feeds_served_from_cache(
+        client, django_assert_num_queries, post_with_published_location):
+    post = post_with_published_location
+    urls = (
+        '/',
+        f'/category/{post.category.slug}/',
+        f'/profile/{post.author.username}/',
+        f'/posts/{post.id}/',
+    )
+    for url in urls:
+        get_content(client, url)
+    Post.objects.filter(pk=post.pk).update(title='Заголовок без сигнала')
+
+    for url in urls:
+        with django_assert_num_queries(0):
+            content = get_content(client, url)
+        assert 'Заголовок без сигнала' not in content, (
+            f'Убедитесь, что страница `{url}` отдаётся анонимному'
+            ' пользователю из кэша без запросов к базе данных.'
+        )
+
+    post.title = 'Заголовок после сохранения'
+    post.save()
+    for url in urls:
+        assert 'Заголовок после сохранения' in get_content(client, url), (
+            f'Убедитесь, что кэш страницы `{url}` сбрасывается при'
+            ' изменении публикации.'
+        )
+
+
+def test_page_number_is_part_of_cache_key(
+        client, many_posts_with_published_locations):
+    first = client.get('/').context['page_obj']
+    second = client.get('/?page=2').context['page_obj']
+    assert first.number == 1 and second.number == 2, (
+        'Убедитесь, что разные страницы ленты кэшируются отдельно.'
+    )
+
+
+def test_authenticated_pages_not_cached(client, user_client, user):
+    url = f'/profile/{user.username}/'
+    get_content(client, url)
+    get_content(user_client, url)
+    type(user).objects.filter(pk=user.pk).update(first_name='Новоеимя')
+
+    assert 'Новоеимя' not in get_content(client, url)
+    assert 'Новоеимя' in get_content(user_client, url), (
+        'Убедитесь, что авторизованным пользователям страницы не отдаются'
+        ' из кэша.'
+    )
+
+
+def test_comment_purges_post_page(
+        client, user_client, post_with_published_location):
+    post = post_with_published_location
+    get_content(client, f'/posts/{post.id}/')
+    user_client.post(f'/posts/{post.id}/comment/', {'text': 'Свежий'})
+    assert 'Свежий' in get_content(client, f'/posts/{post.id}/'), (
+        'Убедитесь, что кэш страницы публикации сбрасывается при'
+        ' добавлении комментария.'
+    )
+
+
+def test_category_change_purges_pages(
+        client, post_with_published_location):
+    post = post_with_published_location
+    get_content(client, f'/posts/{post.id}/')
+    post.category.is_published = False
+    post.category.save()
+    assert client.get(f'/posts/{post.id}/').status_code == 404, (
+        'Убедитесь, что кэш страниц сбрасывается при снятии категории с'
+        ' публикации.'
+    )
@@ -0,0 +1,87 @@
+import pytest
+from django.utils import timezone
+
+from blog.models import Post
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_feed_page(client, url, cursor=None):
+    response = client.get(url, {'cursor': cursor} if cursor else {})
+    assert response.status_code == 200, (
+        'Убедитесь, что лента загружается в режиме курсорной пагинации.'
+    )
+    return response.context['page_obj']
+
+
+@pytest.fixture
+def keyset_feed(settings):
+    settings.FEED_PAGINATION = 'keyset'
+
+
+@pytest.mark.usefixtures('keyset_feed')
+def test_keyset_pages_walk_whole_feed(
+        user_client, many_posts_with_published_locations):
+    expected = list(
+        Post.objects.filter(
+            is_published=True,
+            pub_date__lt=timezone.now(),
+            category__is_published=True,
+        ).order_by('-pub_date', '-id').values_list('id', flat=True)
+    )
+    assert len(expected) > N_PER_PAGE
+
+    seen, pages, cursor = [], [], None
+    while True:
+        page = get_feed_page(user_client, '/', cursor)
+        assert len(page) <= N_PER_PAGE, (
+            'Убедитесь, что на странице курсорной пагинации не больше'
+            f' {N_PER_PAGE} публикаций.'
+        )
+        pages.append(page)
+        seen.extend(post.id for post in page)
+        if not page.has_next():
+            break
+        cursor = page.next_cursor
+
+    assert seen == expected, (
+        'Убедитесь, что переход по курсорам `next` обходит ленту целиком,'
+        ' без пропусков и повторов, «от новых к старым».'
+    )
+    assert not pages[0].has_previous()
+
+    previous = get_feed_page(user_client, '/', pages[1].previous_cursor)
+    assert [post.id for post in previous] == [post.id for post in pages[0]], (
+        'Убедитесь, что курсор `previous` возвращает предыдущую страницу.'
+    )
+
+    last = get_feed_page(user_client, '/', pages[0].last_cursor)
+    assert [post.id for post in last] == expected[-len(last):]
+    assert not last.has_next()
+
+
+@pytest.mark.usefixtures('keyset_feed')
+def test_keyset_tampered_cursor_falls_back_to_first_page(
+        user_client, many_posts_with_published_locations):
+    first = get_feed_page(user_client, '/')
+    tampered = first.next_cursor[:-1] + (
+        'A' if first.next_cursor[-1] != 'A' else 'B'
+    )
+    page = get_feed_page(user_client, '/', tampered)
+    assert [post.id for post in page] == [post.id for post in first], (
+        'Убедитесь, что повреждённый курсор открывает первую страницу ленты.'
+    )
+
+
+@pytest.mark.usefixtures('keyset_feed')
+def test_keyset_feeds_render_cursor_links(
+        user, user_client, many_posts_with_published_locations):
+    category = many_posts_with_published_locations[0].category
+    for url in ('/', f'/category/{category.slug}/',
+                f'/profile/{user.username}/'):
+        content = user_client.get(url).content.decode('utf-8')
+        assert '?cursor=' in content and '?page=' not in content, (
+            f'Убедитесь, что пагинатор страницы `{url}` в режиме курсорной'
+            ' пагинации ссылается на курсоры, а не на номера страниц.'
+        )
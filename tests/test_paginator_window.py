@@ -0,0 +1,57 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import RequestFactory
+from django.views.generic import ListView
+
+from blog.pagination import FeedPaginationMixin
+
+
+class RangeFeedView(FeedPaginationMixin, ListView):
+    paginate_by = 10
+    template_name = 'includes/paginator.html'
+    n_items = 0
+
+    def get_queryset(self):
+        return range(self.n_items)
+
+
+def render_links(n_pages, page):
+    request = RequestFactory().get('/', {'page': page})
+    response = RangeFeedView.as_view(n_items=n_pages * 10)(request)
+    return response.render().content.decode('utf-8').count('page-link')
+
+
+@pytest.mark.parametrize('page', [1, 5, 'last'])
+def test_paginator_renders_bounded_window(page):
+    small, huge = 10, 100_000
+    small_links = render_links(small, small if page == 'last' else page)
+    huge_links = render_links(huge, huge if page == 'last' else page)
+    assert huge_links == small_links, (
+        'Убедитесь, что число ссылок пагинатора не зависит от общего числа'
+        ' страниц.'
+    )
+
+
+def test_paginator_window_around_current_page():
+    request = RequestFactory().get('/', {'page': 50_000})
+    response = RangeFeedView.as_view(n_items=1_000_000)(request)
+    content = response.render().content.decode('utf-8')
+    for number in (1, 49_999, 50_000, 50_001, 100_000):
+        assert f'>{number}<' in content
+    assert '>2<' not in content and '…' in content
+
+
+def test_bench_paginator_reports_each_feed():
+    stdout = StringIO()
+    call_command(
+        'bench_paginator', '--pages', '10', '100000', '--repeat', '1',
+        stdout=stdout
+    )
+    lines = stdout.getvalue().splitlines()
+    assert len(lines) == 2
+    assert len({line.rsplit('ссылок:', 1)[1] for line in lines}) == 1, (
+        'Убедитесь, что команда показывает одинаковое число ссылок для'
+        ' коротких и длинных лент.'
+    )
@@ -0,0 +1,52 @@
+import pytest
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_index(client):
+    return client.get('/').content.decode('utf-8')
+
+
+def test_post_card_is_cached(user_client, post_with_published_location):
+    post = post_with_published_location
+    assert post.title in get_index(user_client)
+
+    Post.objects.filter(pk=post.pk).update(title='Заголовок без сигнала')
+    assert 'Заголовок без сигнала' not in get_index(user_client), (
+        'Убедитесь, что карточка публикации берётся из кэша фрагментов.'
+    )
+
+
+def test_post_card_invalidation(
+        user_client, post_with_published_location, comment_to_a_post):
+    post = post_with_published_location
+    assert '(1)' in get_index(user_client)
+
+    post.title = 'Новый заголовок'
+    post.save()
+    assert 'Новый заголовок' in get_index(user_client), (
+        'Убедитесь, что карточка обновляется после изменения публикации.'
+    )
+
+    user_client.post(f'/posts/{post.id}/comment/', {'text': 'Ещё один'})
+    assert '(2)' in get_index(user_client), (
+        'Убедитесь, что карточка обновляется после добавления комментария.'
+    )
+
+    post.category.title = 'Новая категория'
+    post.category.save()
+    post.location.name = 'Новое место'
+    post.location.save()
+    content = get_index(user_client)
+    assert 'Новая категория' in content and 'Новое место' in content, (
+        'Убедитесь, что карточка обновляется после изменения категории и'
+        ' местоположения.'
+    )
+
+    post.author.username = 'renamed_author'
+    post.author.save()
+    assert '@renamed_author' in get_index(user_client), (
+        'Убедитесь, что карточка обновляется после изменения автора.'
+    )
@@ -0,0 +1,51 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.utils import timezone
+
+from blog.auxiliary import publication_cutoff
+
+pytestmark = [pytest.mark.django_db]
+
+
+def feed_post_ids(client, url='/'):
+    return {post.id for post in client.get(url).context['page_obj']}
+
+
+def test_scheduled_post_appears_without_restart(
+        mixer, user_client, user, published_category):
+    now = timezone.now()
+    post = mixer.blend(
+        'blog.Post',
+        author=user,
+        is_published=True,
+        category=published_category,
+        pub_date=now + timedelta(minutes=5),
+    )
+    assert post.id not in feed_post_ids(user_client), (
+        'Убедитесь, что отложенная публикация не видна в ленте до даты'
+        ' публикации.'
+    )
+
+    with mock.patch(
+        'django.utils.timezone.now', return_value=now + timedelta(minutes=7)
+    ):
+        for url in ('/', f'/category/{published_category.slug}/'):
+            assert post.id in feed_post_ids(user_client, url), (
+                'Убедитесь, что отложенная публикация появляется в ленте'
+                f' `{url}` после наступления даты публикации, без'
+                ' перезапуска сервера.'
+            )
+
+
+def test_publication_cutoff_granularity(settings):
+    now = timezone.now().replace(second=42, microsecond=123)
+    with mock.patch('django.utils.timezone.now', return_value=now):
+        settings.PUBLICATION_CUTOFF_GRANULARITY = 60
+        assert publication_cutoff() == now.replace(second=0, microsecond=0), (
+            'Убедитесь, что граница публикации округляется вниз до начала'
+            ' интервала.'
+        )
+        settings.PUBLICATION_CUTOFF_GRANULARITY = 0
+        assert publication_cutoff() == now
@@ -0,0 +1,54 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+# The user lookup made by the auth middleware for a logged-in user; the
+# session and, after the first request, the user come from the cache.
+AUTH_QUERIES = 1
+
+
+def feed_urls(user, posts):
+    return {
+        'index': '/',
+        'category': f'/category/{posts[0].category.slug}/',
+        'profile': f'/profile/{user.username}/',
+    }
+
+
+@pytest.mark.parametrize(
+    ('page', 'page_queries'),
+    [
+        # Posts, plus the COUNT on a cold cache.
+        ('index', 1),
+        # Category or profile owner, posts, plus the COUNT.
+        ('category', 2),
+        ('profile', 2),
+    ]
+)
+def test_feed_query_count(
+        page, page_queries, user, another_user_client,
+        django_assert_num_queries, many_posts_with_published_locations):
+    url = feed_urls(user, many_posts_with_published_locations)[page]
+    with django_assert_num_queries(AUTH_QUERIES + page_queries + 1):
+        another_user_client.get(url)
+    with django_assert_num_queries(page_queries):
+        another_user_client.get(url)
+
+
+@pytest.mark.parametrize('viewer', ['author', 'reader', 'anonymous'])
+def test_post_detail_query_count(
+        viewer, user_client, another_user_client, client,
+        django_assert_num_queries, post_with_published_location, mixer):
+    post = post_with_published_location
+    mixer.cycle(3).blend('blog.Comment', post=post)
+    http_client, auth_queries = {
+        'author': (user_client, AUTH_QUERIES),
+        'reader': (another_user_client, AUTH_QUERIES),
+        'anonymous': (client, 0),
+    }[viewer]
+    # The post with its category, location and author, then its comments
+    # with their authors.
+    with django_assert_num_queries(auth_queries + 2):
+        response = http_client.get(f'/posts/{post.id}/')
+    assert response.status_code == 200
+    assert len(response.context['comments']) == 3
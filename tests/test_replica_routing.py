@@ -0,0 +1,119 @@
+import pytest
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from blog import routers
+from blog.models import Comment, Post
+from blog.routers import PIN_COOKIE, primary_reads, read_from_replica
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def replica_reads(settings, monkeypatch):
+    # The replica alias is only recorded: queries still run on 'default'.
+    settings.DATABASE_REPLICAS = ['replica']
+    reads = []
+
+    def choice(aliases):
+        reads.append(aliases)
+        return 'default'
+
+    monkeypatch.setattr(routers.random, 'choice', choice)
+    return reads
+
+
+@read_from_replica
+def alias_view(request):
+    return HttpResponse(router.db_for_read(Post))
+
+
+def test_router_reads_from_replica_inside_view(settings):
+    settings.DATABASE_REPLICAS = ['replica']
+    factory = RequestFactory()
+    assert alias_view(factory.get('/')).content == b'replica'
+    assert router.db_for_read(Post) == 'default', (
+        'Убедитесь, что вне представлений чтение идёт из основной базы.'
+    )
+    assert alias_view(factory.post('/')).content == b'default'
+    request = factory.get('/')
+    request.COOKIES[PIN_COOKIE] = '1'
+    assert alias_view(request).content == b'default', (
+        'Убедитесь, что закреплённый клиент читает из основной базы.'
+    )
+    assert router.db_for_write(Post) == 'default'
+
+
+@read_from_replica
+def aliases_view(request):
+    first = router.db_for_read(Post)
+    second = router.db_for_read(Comment)
+    with primary_reads():
+        cached = router.db_for_read(Post)
+    return HttpResponse(f'{first} {second} {cached}')
+
+
+def test_one_replica_per_request(settings):
+    settings.DATABASE_REPLICAS = [f'replica{number}' for number in range(10)]
+    for _ in range(10):
+        first, second, cached = aliases_view(
+            RequestFactory().get('/')
+        ).content.decode().split()
+        assert first == second != 'default', (
+            'Убедитесь, что все запросы к базе в рамках одного HTTP-запроса'
+            ' идут в одну реплику.'
+        )
+        assert cached == 'default', (
+            'Убедитесь, что данные для кэша читаются из основной базы.'
+        )
+
+
+def test_cached_anonymous_pages_read_from_primary(
+        replica_reads, client, post_with_published_location):
+    for url in ('/', f'/posts/{post_with_published_location.id}/'):
+        assert client.get(url).status_code == 200
+    assert not replica_reads, (
+        'Убедитесь, что страницы для кэша анонимных пользователей читаются'
+        ' из основной базы, а не из отстающей реплики.'
+    )
+
+
+@pytest.mark.parametrize('page', ['index', 'category', 'profile', 'detail'])
+def test_read_pages_use_replica(
+        page, replica_reads, another_user_client,
+        post_with_published_location):
+    post = post_with_published_location
+    url = {
+        'index': '/',
+        'category': f'/category/{post.category.slug}/',
+        'profile': f'/profile/{post.author.username}/',
+        'detail': f'/posts/{post.id}/',
+    }[page]
+    assert another_user_client.get(url).status_code == 200
+    assert replica_reads, (
+        f'Убедитесь, что страница `{url}` читает данные из реплики.'
+    )
+
+
+def test_write_pins_client_to_primary(
+        replica_reads, user_client, post_with_published_location):
+    post = post_with_published_location
+    response = user_client.post(
+        f'/posts/{post.id}/comment/', {'text': 'Свежий'}
+    )
+    assert PIN_COOKIE in response.cookies, (
+        'Убедитесь, что после записи клиент закрепляется за основной базой.'
+    )
+    content = user_client.get(f'/posts/{post.id}/').content.decode('utf-8')
+    assert 'Свежий' in content and not replica_reads, (
+        'Убедитесь, что после записи страница публикации читается из'
+        ' основной базы.'
+    )
+
+
+def test_no_pin_without_replicas(user_client, post_with_published_location):
+    response = user_client.post(
+        f'/posts/{post_with_published_location.id}/comment/', {'text': 'Т'}
+    )
+    assert PIN_COOKIE not in response.cookies
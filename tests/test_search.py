@@ -0,0 +1,78 @@
+from datetime import timedelta
+from urllib.parse import quote
+
+import pytest
+from django.utils import timezone
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def search(client, query, **params):
+    response = client.get('/search/', {'q': query, **params})
+    assert response.status_code == 200
+    return response
+
+
+def found_ids(client, query):
+    return [post.id for post in search(client, query).context['page_obj']]
+
+
+@pytest.fixture
+def make_post(mixer, user, published_category):
+    def make(text, title='Заметка', is_published=True):
+        return mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            is_published=is_published, title=title, text=text, image=None,
+            pub_date=timezone.now() - timedelta(days=1)
+        )
+    return make
+
+
+def test_search_ranks_visible_matches(client, make_post):
+    once = make_post('Ехал на велосипеде через парк.')
+    often = make_post('Велосипед, велосипеды и снова велосипед.')
+    make_post('Про лодки.')
+    make_post('Велосипед в черновике.', is_published=False)
+    assert found_ids(client, 'велосипед') == [often.id, once.id], (
+        'Убедитесь, что поиск находит только опубликованные посты и'
+        ' сортирует их по релевантности.'
+    )
+    assert found_ids(client, 'ВЕЛОСИПЕД парк') == [once.id]
+
+
+def test_search_index_follows_updates(client, make_post):
+    post = make_post('Старый текст.')
+    Post.objects.filter(pk=post.pk).update(title='Переименованный')
+    assert found_ids(client, 'переименованный') == [post.id]
+    assert found_ids(client, 'старый') == [post.id]
+    Post.objects.filter(pk=post.pk).delete()
+    assert found_ids(client, 'старый') == []
+
+
+def test_snippet_highlighted_and_escaped(client, make_post):
+    make_post('<script>alert(1)</script> велосипед')
+    content = search(client, 'велосипед').content.decode('utf-8')
+    assert '<mark>велосипед</mark>' in content
+    assert '<script>alert' not in content, (
+        'Убедитесь, что текст фрагмента экранируется.'
+    )
+
+
+@pytest.mark.parametrize('query', ['', '"', 'OR AND NOT', 'title:(x*', '*'])
+def test_search_syntax_not_parsed(client, make_post, query):
+    make_post('Текст')
+    assert found_ids(client, query) == []
+
+
+def test_pages_keep_query(client, make_post):
+    for _ in range(11):
+        make_post('Велосипед')
+    response = search(client, 'велосипед')
+    assert len(response.context['page_obj']) == 10
+    assert f'q={quote("велосипед")}&amp;page=2' in (
+        response.content.decode('utf-8')
+    )
+    second = search(client, 'велосипед', page=2).context['page_obj']
+    assert len(second) == 1
@@ -0,0 +1,97 @@
+import pytest
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.backends import user_cache, user_cache_key
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_session_and_user_served_from_cache(
+        user, user_client, django_assert_num_queries):
+    url = '/profile/edit/'
+    user_client.get(url)
+    with django_assert_num_queries(0):
+        response = user_client.get(url)
+    assert response.context['user'] == user, (
+        'Убедитесь, что сессия и пользователь берутся из кэша без запросов'
+        ' к базе данных.'
+    )
+
+
+def test_cached_user_has_no_password(user, client):
+    user.set_password('Passw0rd-42')
+    user.save()
+    client.login(username=user.username, password='Passw0rd-42')
+    client.get('/profile/edit/')
+    cached = user_cache().get(user_cache_key(user.pk))
+    assert 'password' not in cached and user.password not in cached.values(), (
+        'Убедитесь, что хеш пароля не попадает в кэш.'
+    )
+
+    response = client.post('/profile/edit/', {
+        'username': user.username,
+        'first_name': 'Новоеимя',
+        'last_name': user.last_name,
+        'email': user.email,
+    })
+    assert response.status_code == 302
+    user.refresh_from_db()
+    assert user.check_password('Passw0rd-42'), (
+        'Убедитесь, что сохранение пользователя из кэша не затирает пароль.'
+    )
+    assert client.get('/profile/edit/').status_code == 200
+
+
+def test_profile_edit_refreshes_cached_user(user, user_client):
+    user_client.get('/profile/edit/')
+    user_client.post('/profile/edit/', {
+        'username': user.username,
+        'first_name': 'Новоеимя',
+        'last_name': user.last_name,
+        'email': user.email,
+    })
+    response = user_client.get('/profile/edit/')
+    assert response.context['user'].first_name == 'Новоеимя', (
+        'Убедитесь, что после изменения профиля пользователь не берётся из'
+        ' устаревшего кэша.'
+    )
+
+
+def test_password_change_drops_cached_user(user, user_client, client):
+    user.set_password('old-Passw0rd')
+    user.save()
+    client.login(username=user.username, password='old-Passw0rd')
+    client.get('/profile/edit/')
+    assert user_cache().get(user_cache_key(user.pk)) is not None
+
+    client.post('/auth/password_change/', {
+        'old_password': 'old-Passw0rd',
+        'new_password1': 'new-Passw0rd-42',
+        'new_password2': 'new-Passw0rd-42',
+    })
+    assert user_cache().get(user_cache_key(user.pk)) is None
+    assert user_client.get('/profile/edit/').status_code == 302, (
+        'Убедитесь, что после смены пароля другие сессии пользователя'
+        ' завершаются.'
+    )
+    assert client.get('/profile/edit/').status_code == 200
+
+
+def test_clear_expired_sessions_in_batches(capsys):
+    now = timezone.now()
+    for number in range(5):
+        Session.objects.create(
+            session_key=f'expired{number}', session_data='',
+            expire_date=now - timezone.timedelta(days=1),
+        )
+    Session.objects.create(
+        session_key='active', session_data='',
+        expire_date=now + timezone.timedelta(days=1),
+    )
+    call_command('clear_expired_sessions', '--batch-size', '2')
+    assert list(Session.objects.values_list('pk', flat=True)) == ['active'], (
+        'Убедитесь, что команда удаляет только истёкшие сессии.'
+    )
+    assert '5' in capsys.readouterr().out
@@ -0,0 +1,78 @@
+import sqlite3
+
+import pytest
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+# Allows opening connections; the tests use their own database files.
+pytestmark = [pytest.mark.django_db]
+
+
+def file_connection(path):
+    wrapper = DatabaseWrapper(
+        {**connection.settings_dict, 'NAME': str(path)}, alias='pragmas'
+    )
+    wrapper.ensure_connection()
+    return wrapper
+
+
+def pragma(wrapper, name):
+    with wrapper.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = tmp_path / 'db.sqlite3'
+    with sqlite3.connect(path) as setup:
+        setup.execute('CREATE TABLE note (text TEXT)')
+        setup.execute("INSERT INTO note VALUES ('первая')")
+    return path
+
+
+def test_pragmas_applied_to_new_connections(settings, database):
+    settings.SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL', 'synchronous': 'NORMAL',
+        'busy_timeout': 1234, 'temp_store': 'MEMORY',
+    }
+    wrapper = file_connection(database)
+    try:
+        assert pragma(wrapper, 'journal_mode') == 'wal'
+        assert pragma(wrapper, 'synchronous') == 1
+        assert pragma(wrapper, 'busy_timeout') == 1234
+        assert pragma(wrapper, 'temp_store') == 2
+    finally:
+        wrapper.close()
+
+
+@pytest.mark.parametrize(('journal_mode', 'reader_blocked'), [
+    ('WAL', False),
+    ('DELETE', True),
+])
+def test_readers_not_blocked_by_writer(
+        settings, database, journal_mode, reader_blocked):
+    settings.SQLITE_PRAGMAS = {
+        'journal_mode': journal_mode, 'busy_timeout': 100,
+    }
+    writer, reader = file_connection(database), file_connection(database)
+    try:
+        with writer.cursor() as cursor:
+            cursor.execute('BEGIN EXCLUSIVE')
+            cursor.execute("INSERT INTO note VALUES ('вторая')")
+        try:
+            with reader.cursor() as cursor:
+                cursor.execute('SELECT text FROM note')
+                texts = [row[0] for row in cursor.fetchall()]
+        except Exception as error:
+            assert reader_blocked, error
+        else:
+            assert not reader_blocked
+            assert texts == ['первая'], (
+                'Читатель должен видеть данные до незавершённой записи.'
+            )
+        with writer.cursor() as cursor:
+            cursor.execute('COMMIT')
+    finally:
+        writer.close()
+        reader.close()
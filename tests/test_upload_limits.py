@@ -0,0 +1,131 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client
+from PIL import Image
+
+from blog.forms import PostForm
+from blog.models import Post
+from blog.uploads import LimitedTemporaryFileUploadHandler
+
+pytestmark = [pytest.mark.django_db]
+
+
+def image_bytes(width, height):
+    image_data = BytesIO()
+    image = Image.effect_noise((width, height), 64).convert('RGB')
+    image.save(image_data, 'PNG')
+    return image_data.getvalue()
+
+
+def post_form(category, content):
+    return PostForm(
+        data={
+            'title': 'Пост',
+            'text': 'Текст',
+            'pub_date': '2020-01-01T12:00',
+            'category': category.id,
+        },
+        files={'image': SimpleUploadedFile('image.png', content)},
+    )
+
+
+def test_handler_stops_writing_past_limit(settings):
+    settings.POST_IMAGE_MAX_SIZE = 1000
+    handler = LimitedTemporaryFileUploadHandler()
+    handler.new_file('image', 'image.png', 'image/png', 5000)
+    for start in range(0, 5000, 300):
+        handler.receive_data_chunk(b'x' * 300, start)
+    uploaded = handler.file_complete(5100)
+    assert uploaded.size == 5100
+    assert len(uploaded.read()) == 1000, (
+        'Убедитесь, что на диск записывается не больше допустимого размера.'
+    )
+    handler.upload_interrupted()
+
+
+def test_oversized_upload_rejected(
+        settings, user_client, published_category):
+    settings.POST_IMAGE_MAX_SIZE = 1000
+    settings.FILE_UPLOAD_MAX_MEMORY_SIZE = 0
+    content = image_bytes(300, 300)
+    assert len(content) > 1000
+    response = user_client.post('/posts/create/', {
+        'title': 'Пост',
+        'text': 'Текст',
+        'pub_date': '2020-01-01T12:00',
+        'category': published_category.id,
+        'image': SimpleUploadedFile('image.png', content),
+    })
+    assert response.status_code == 200
+    assert any(
+        isinstance(handler, LimitedTemporaryFileUploadHandler)
+        for handler in response.wsgi_request.upload_handlers
+    )
+    assert 'image' in response.context['form'].errors
+    assert not Post.objects.exists()
+
+
+def test_create_view_still_checks_csrf(user, published_category):
+    client = Client(enforce_csrf_checks=True)
+    client.force_login(user)
+    response = client.post('/posts/create/', {
+        'title': 'Пост',
+        'text': 'Текст',
+        'pub_date': '2020-01-01T12:00',
+        'category': published_category.id,
+    })
+    assert response.status_code == 403, (
+        'Убедитесь, что страница создания поста проверяет CSRF-токен.'
+    )
+    assert not Post.objects.exists()
+
+
+def test_admin_upload_not_truncated_and_rejected(
+        settings, admin_client, user, published_category, media_root):
+    settings.POST_IMAGE_MAX_SIZE = 1000
+    settings.FILE_UPLOAD_MAX_MEMORY_SIZE = 0
+    response = admin_client.post('/admin/blog/post/add/', {
+        'title': 'Пост',
+        'text': 'Текст',
+        'pub_date_0': '2020-01-01',
+        'pub_date_1': '12:00',
+        'author': user.id,
+        'category': published_category.id,
+        'is_published': True,
+        'image': SimpleUploadedFile('image.png', image_bytes(300, 300)),
+    })
+    assert response.status_code == 200
+    assert not any(
+        isinstance(handler, LimitedTemporaryFileUploadHandler)
+        for handler in response.wsgi_request.upload_handlers
+    ), 'Убедитесь, что загрузки обрезаются только на страницах поста.'
+    assert 'image' in response.context['adminform'].form.errors, (
+        'Убедитесь, что в админке слишком большое изображение отклоняется.'
+    )
+    assert not Post.objects.exists()
+
+
+def test_pixel_limit_checked_from_header(
+        settings, monkeypatch, published_category):
+    settings.POST_IMAGE_MAX_PIXELS = 100 * 100
+    content = image_bytes(200, 200)
+
+    def no_full_open(*args, **kwargs):
+        raise AssertionError('Изображение открыто целиком.')
+
+    monkeypatch.setattr(Image.Image, 'verify', no_full_open, raising=False)
+    monkeypatch.setattr(Image.Image, 'load', no_full_open)
+    form = post_form(published_category, content)
+    assert not form.is_valid()
+    assert form.errors['image'] == [
+        'Изображение 200×200 больше 0.01 Мпикс.'
+    ]
+
+
+def test_image_within_limits_accepted(settings, published_category):
+    settings.POST_IMAGE_MAX_SIZE = 10 ** 6
+    settings.POST_IMAGE_MAX_PIXELS = 10 ** 6
+    form = post_form(published_category, image_bytes(200, 200))
+    assert form.is_valid(), form.errors